@@ -0,0 +1,294 @@
+"""
+Local stand-in for the APIs used by EmailOSINT and the analyzers
+
+Serves Gravatar, HIBP, DeHashed, LeakCheck, IntelX, DuckDuckGo (through the
+HttpSearch backend), OpenAI chat completions and Gemini streaming with
+configurable latency, error rate and payload sizes, so runs can be timed
+without touching live services.
+
+    with MockServer(MockSettings(latency=0.05)) as server:
+        config = server.config('/tmp/bench-cache')
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from aiohttp import web
+
+
+@dataclass
+class MockSettings:
+    latency: float = 0.05           # seconds added to every response
+    jitter: float = 0.02            # +/- random spread of the latency
+    error_rate: float = 0.0         # share of requests answered with 500 (429 for searches)
+    latencies: Dict[str, float] = field(default_factory=dict)   # per-service overrides
+    breaches: int = 20              # HIBP breaches per account
+    credentials: int = 50           # DeHashed entries per account
+    leaks: int = 15                 # LeakCheck sources per account
+    records: int = 40               # IntelX records per search
+    hits: int = 10                  # search hits per query
+    ai_chunks: int = 40             # streamed chunks per analysis
+    ai_chunk_delay: float = 0.01    # seconds between streamed chunks
+    seed: int = 0
+
+
+class MockServer:
+    """aiohttp stand-in running on its own thread and event loop"""
+
+    def __init__(self, settings: Optional[MockSettings] = None, host: str = '127.0.0.1', port: int = 0):
+        self.settings = settings or MockSettings()
+        self.host = host
+        self.port = port
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+        self._random = random.Random(self.settings.seed)
+        self._searches: Dict[str, int] = {}
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def config(self, cache_dir: str, **overrides) -> Dict:
+        """config.json equivalent pointing every source and analyzer at this server"""
+        config = {
+            'cache_dir': cache_dir,
+            'disable_cache': True,
+            'intelx_api_key': 'bench',
+            'dehashed_api_key': 'bench@example.com:bench',
+            'leakcheck_api_key': 'bench',
+            'openai_api_key': 'bench',
+            'gemini_api_key': 'bench',
+            'api_base_urls': {
+                'gravatar': f"{self.url}/gravatar",
+                'hibp': f"{self.url}/hibp",
+                'dehashed': f"{self.url}/dehashed",
+                'leakcheck': f"{self.url}/leakcheck",
+            },
+            'intelx_endpoints': [f"{self.url}/intelx"],
+            'duckduckgo_endpoint': f"{self.url}/duckduckgo",
+            'openai_base_url': f"{self.url}/openai/v1",
+            'gemini_api_endpoint': f"{self.url}/gemini",
+        }
+        config.update(overrides)
+        return config
+
+    # --- lifecycle -------------------------------------------------------
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='mock-server', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("mock server did not start")
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._runner = web.AppRunner(self._app())
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    # --- helpers ---------------------------------------------------------
+
+    async def _delay(self, service: str):
+        self.requests[service] = self.requests.get(service, 0) + 1
+        latency = self.settings.latencies.get(service, self.settings.latency)
+        jitter = self._random.uniform(-self.settings.jitter, self.settings.jitter)
+        await asyncio.sleep(max(0.0, latency + jitter))
+
+    def _fails(self) -> bool:
+        if self._random.random() < self.settings.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+    def _app(self):
+        routes = web.RouteTableDef()
+        s = self.settings
+
+        @routes.get('/gravatar/avatar/{hash}')
+        async def gravatar_avatar(request):
+            await self._delay('gravatar')
+            if self._fails():
+                return web.Response(status=500)
+            return web.Response(body=b'\x89PNG' + b'\0' * 2048, content_type='image/png')
+
+        @routes.get('/gravatar/{hash}.json')
+        async def gravatar_profile(request):
+            await self._delay('gravatar')
+            etag = f'"{request.match_info["hash"][:16]}"'
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304, headers={'ETag': etag})
+            return web.json_response(headers={'ETag': etag}, data={'entry': [{
+                'displayName': 'Bench User',
+                'aboutMe': 'Offline benchmark profile',
+                'urls': [{'value': f"https://example.com/{i}"} for i in range(3)],
+            }]})
+
+        def breach(i):
+            return {'Name': f"Breach{i}", 'Title': f"Breach {i}", 'Domain': f"breach{i}.example",
+                    'BreachDate': f"20{10 + i % 14:02d}-01-01", 'PwnCount': 1000 * (i + 1),
+                    'DataClasses': ['Email addresses', 'Passwords', 'Usernames'],
+                    'Description': 'Lorem ipsum ' * 20}
+
+        @routes.get('/hibp/breaches')
+        async def hibp_breaches(request):
+            await self._delay('hibp')
+            etag = f'"catalog-{s.breaches}"'
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304, headers={'ETag': etag})
+            # The real catalog lists every breach, not only the ones an account is in
+            return web.json_response([breach(i) for i in range(max(s.breaches, 800))], headers={'ETag': etag})
+
+        @routes.get('/hibp/breachedaccount/{email}')
+        async def hibp(request):
+            await self._delay('hibp')
+            if self._fails():
+                return web.Response(status=500)
+            if request.query.get('truncateResponse', 'true') == 'true':
+                return web.json_response([{'Name': f"Breach{i}"} for i in range(s.breaches)])
+            return web.json_response([breach(i) for i in range(s.breaches)])
+
+        @routes.get('/dehashed/search')
+        async def dehashed(request):
+            await self._delay('dehashed')
+            if self._fails():
+                return web.Response(status=500)
+            email = request.query.get('query', '').replace('email:', '')
+            size = int(request.query.get('size', 100))
+            start = (int(request.query.get('page', 1)) - 1) * size
+            # Every tenth entry repeats the one before it, as re-imported dumps do
+            return web.json_response({'total': s.credentials, 'entries': [
+                {'id': str(i), 'email': email, 'username': f"user{i - (i % 10 == 9)}",
+                 'password': f"hunter{i - (i % 10 == 9)}", 'hashed_password': f"{i - (i % 10 == 9):064x}",
+                 'database_name': f"Database{(i - (i % 10 == 9)) % 7}"}
+                for i in range(start, min(start + size, s.credentials))
+            ]})
+
+        @routes.get('/leakcheck')
+        async def leakcheck(request):
+            await self._delay('leakcheck')
+            if self._fails():
+                return web.Response(status=500)
+            return web.json_response({'success': True, 'found': s.leaks, 'sources': [
+                {'name': f"leak{i}.example", 'date': f"20{10 + i % 14:02d}-06"} for i in range(s.leaks)
+            ]})
+
+        @routes.get('/intelx/authenticate/info')
+        async def intelx_info(request):
+            await self._delay('intelx')
+            return web.json_response({'searches': 100})
+
+        @routes.post('/intelx/intelligent/search')
+        async def intelx_search(request):
+            await self._delay('intelx')
+            if self._fails():
+                return web.Response(status=500)
+            search_id = f"search-{sum(self.requests.values())}"
+            self._searches[search_id] = 0
+            return web.json_response({'id': search_id, 'status': 0})
+
+        @routes.get('/intelx/intelligent/search/result')
+        async def intelx_result(request):
+            await self._delay('intelx')
+            search_id = request.query.get('id', '')
+            polls = self._searches.get(search_id)
+            if polls is None:
+                return web.json_response({'records': [], 'status': 2})
+            self._searches[search_id] = polls + 1
+            if polls == 0:
+                # Still indexing on the first poll
+                return web.json_response({'records': [], 'status': 3})
+            offset = int(request.query.get('offset', 0))
+            limit = int(request.query.get('limit', 20))
+            records = [
+                {'name': f"record-{i}", 'date': '2023-01-01T00:00:00Z', 'bucket': 'leaks.public',
+                 'media': 24, 'systemid': f"{i:032x}"}
+                for i in range(offset, min(offset + limit, s.records))
+            ]
+            done = offset + len(records) >= s.records
+            return web.json_response({'records': records, 'status': 1 if done else 0})
+
+        @routes.get('/intelx/intelligent/search/terminate')
+        async def intelx_terminate(request):
+            self._searches.pop(request.query.get('id', ''), None)
+            return web.Response(text='')
+
+        @routes.get('/duckduckgo/text')
+        async def duckduckgo(request):
+            await self._delay('duckduckgo')
+            if self._fails():
+                return web.Response(status=429)
+            query = request.query.get('q', '')
+            count = min(int(request.query.get('max_results', 10)), s.hits)
+            return web.json_response([
+                {'title': f"Result {i} for {query}", 'href': f"https://site{i % 5}.example/page/{i}?utm_source=x",
+                 'body': 'Snippet text ' * 15}
+                for i in range(count)
+            ])
+
+        async def stream_text(request, service, frame):
+            await self._delay(service)
+            if self._fails():
+                return web.json_response({'error': {'message': 'mock failure'}}, status=500)
+            # OpenAI streams server-sent events, the Gemini REST transport a JSON array
+            sse = service == 'openai'
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream' if sse else 'application/json'})
+            await response.prepare(request)
+            if not sse:
+                await response.write(b'[')
+            for i in range(s.ai_chunks):
+                chunk = json.dumps(frame(f'word{i} '))
+                if sse:
+                    await response.write(f"data: {chunk}\n\n".encode())
+                else:
+                    await response.write(f"{',' if i else ''}{chunk}".encode())
+                await asyncio.sleep(s.ai_chunk_delay)
+            await response.write(b"data: [DONE]\n\n" if sse else b']')
+            await response.write_eof()
+            return response
+
+        @routes.post('/openai/v1/chat/completions')
+        async def openai(request):
+            payload = await request.json()
+            created = int(time.time())
+            return await stream_text(request, 'openai', lambda text: {
+                'id': 'chatcmpl-bench', 'object': 'chat.completion.chunk', 'created': created,
+                'model': payload.get('model', 'bench'),
+                'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': text}, 'finish_reason': None}],
+            })
+
+        @routes.post('/gemini/{version}/models/{method}')
+        async def gemini(request):
+            return await stream_text(request, 'gemini', lambda text: {
+                'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'index': 0}],
+            })
+
+        app = web.Application()
+        app.add_routes(routes)
+        return app
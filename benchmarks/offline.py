@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmarks against the local stand-in API server
+
+Runs a full run_search, a batch of concurrent lookups and both analyzers
+against benchmarks/mock_server.py, reports wall time, throughput and peak
+Python memory per scenario, appends the numbers to a results file and
+compares them with the previous run that used the same settings.
+
+    python benchmarks/offline.py [--latency 0.05] [--error-rate 0] [--batch 20]
+                                 [--fail-threshold 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockServer, MockSettings  # noqa: E402
+
+DEFAULT_RESULTS = os.path.join(ROOT, 'benchmarks', 'results', 'offline.jsonl')
+SCENARIOS = ('search', 'batch', 'analyzers')
+
+
+def quiet_output():
+    """Benchmarks time the work, not the terminal"""
+    from utils import analyzers, email_lookup, report_renderer
+    for module in (analyzers, email_lookup, report_renderer):
+        module.console.quiet = True
+
+
+def scheduler(config, args):
+    from utils.ddg_scheduler import DuckDuckGoScheduler
+    # Pacing is DuckDuckGo's limit, not ours; measure the tool instead
+    return DuckDuckGoScheduler(rate=args.ddg_rate, burst=args.ddg_rate, endpoint=config['duckduckgo_endpoint'])
+
+
+def measured(func):
+    """Run func and return (result, seconds, peak traced memory in KiB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024
+
+
+def bench_search(config, args):
+    """Full run_search (collection and rendering) for one address"""
+    from utils.email_lookup import EmailOSINT
+
+    osint = EmailOSINT(config=config, ddg=scheduler(config, args))
+    timings, peaks = [], []
+    for run in range(args.runs):
+        _, elapsed, peak = measured(lambda: osint.run_search(f"search{run}@example.com", config))
+        timings.append(elapsed)
+        peaks.append(peak)
+    wall = statistics.median(timings)
+    return {'wall': wall, 'throughput': 1 / wall, 'peak_kib': max(peaks)}
+
+
+def bench_batch(config, args):
+    """Many lookups sharing one engine, the way bulk audits run"""
+    from utils.email_lookup import EmailOSINT
+    from utils.source_engine import SourceEngine
+
+    async def batch(run):
+        osint = EmailOSINT(engine=SourceEngine(config.get('source_concurrency')), config=config,
+                           ddg=scheduler(config, args))
+        workers = asyncio.Semaphore(args.workers)
+
+        async def lookup(index):
+            async with workers:
+                return await osint.collect_async(f"batch{run}-{index}@example.com", config, show_progress=False)
+
+        return await asyncio.gather(*(lookup(i) for i in range(args.batch)))
+
+    timings, peaks = [], []
+    for run in range(args.runs):
+        _, elapsed, peak = measured(lambda: asyncio.run(batch(run)))
+        timings.append(elapsed)
+        peaks.append(peak)
+    wall = statistics.median(timings)
+    return {'wall': wall, 'throughput': args.batch / wall, 'peak_kib': max(peaks)}
+
+
+def bench_analyzers(config, args):
+    """Both analyzers streaming from the stand-in, with the result cache off"""
+    from utils.analyzers import create_analyzer
+    from utils.email_lookup import EmailOSINT
+
+    report = asyncio.run(EmailOSINT(config=config, ddg=scheduler(config, args))
+                         .collect_async('analyze@example.com', config, show_progress=False))
+    findings = {'email': report.to_dict()}
+
+    async def analyze(analyzer):
+        start = time.perf_counter()
+        first = None
+        async for _ in analyzer.stream_analysis(findings):
+            first = first if first is not None else time.perf_counter() - start
+        return first, time.perf_counter() - start
+
+    async def runs(provider):
+        # One event loop for every run so the SDK clients keep their connections
+        analyzer = create_analyzer(provider, test_mode=False, use_cache=False)
+        results = []
+        for _ in range(args.runs):
+            tracemalloc.start()
+            first, total = await analyze(analyzer)
+            results.append((first, total, tracemalloc.get_traced_memory()[1] / 1024))
+            tracemalloc.stop()
+        client = getattr(analyzer, 'client', None)
+        if client is not None:
+            # Close the HTTP pool while its event loop is still running
+            await client.close()
+        return results
+
+    metrics = {}
+    for provider in ('openai', 'gemini'):
+        firsts, timings, peaks = zip(*asyncio.run(runs(provider)))
+        wall = statistics.median(timings)
+        metrics[provider] = {'wall': wall, 'first_chunk': statistics.median(firsts),
+                             'throughput': 1 / wall, 'peak_kib': max(peaks)}
+    return metrics
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def previous_result(path, params):
+    """Most recent stored result recorded with the same settings"""
+    if not os.path.exists(path):
+        return None
+    match = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('params') == params:
+                match = record
+    return match
+
+
+def flatten(metrics, prefix=''):
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{name}.")
+        else:
+            yield f"{prefix}{name}", value
+
+
+def report(metrics, previous, threshold):
+    """Print the results next to the previous run; returns True on a wall-time regression"""
+    before = dict(flatten(previous['metrics'])) if previous else {}
+    if previous:
+        print(f"\nCompared with {previous['revision']} ({previous['timestamp']}):")
+    regressed = False
+    for name, value in flatten(metrics):
+        unit = 'KiB' if name.endswith('_kib') else '/s' if name.endswith('throughput') else 's'
+        line = f"  {name:<28} {value:10.3f} {unit}"
+        old = before.get(name)
+        if old:
+            change = (value - old) / old * 100
+            line += f"   {change:+6.1f}% (was {old:.3f})"
+            if threshold is not None and name.endswith('wall') and change > threshold:
+                line += '  REGRESSION'
+                regressed = True
+        print(line)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data-gather against a local stand-in API server")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--runs', type=int, default=3, help="Runs per scenario, median reported (default: 3)")
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds per stand-in response (default: 0.05)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="+/- random latency spread (default: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of failing responses (default: 0)")
+    parser.add_argument('--payload-scale', type=float, default=1.0, help="Multiply every payload size (default: 1)")
+    parser.add_argument('--batch', type=int, default=20, help="Lookups in the batch scenario (default: 20)")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent lookups in the batch (default: 4)")
+    parser.add_argument('--ddg-rate', type=float, default=100.0, help="Search requests per second allowed (default: 100)")
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help="JSONL file results are appended to")
+    parser.add_argument('--no-save', action='store_true', help="Do not store this run")
+    parser.add_argument('--fail-threshold', type=float, help="Exit 1 if a wall time is this many %% slower than before")
+    args = parser.parse_args()
+
+    defaults = MockSettings()
+    settings = MockSettings(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        **{name: max(1, int(getattr(defaults, name) * args.payload_scale))
+           for name in ('breaches', 'credentials', 'leaks', 'records', 'hits', 'ai_chunks')}
+    )
+    params = {key: value for key, value in vars(args).items()
+              if key not in ('results', 'no_save', 'fail_threshold')}
+
+    from utils.config import use_config
+    quiet_output()
+    benches = {'search': bench_search, 'batch': bench_batch, 'analyzers': bench_analyzers}
+
+    with tempfile.TemporaryDirectory() as cache_dir, MockServer(settings) as server:
+        config = use_config(server.config(cache_dir))
+        metrics = {}
+        for name in args.scenarios:
+            print(f"[*] {name}...", flush=True)
+            metrics[name] = benches[name](config, args)
+        stand_in = {'requests': server.requests, 'errors': server.errors}
+
+    import resource
+    metrics['max_rss_kib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    previous = previous_result(args.results, params)
+    regressed = report(metrics, previous, args.fail_threshold)
+    print(f"  stand-in requests: {sum(stand_in['requests'].values())} ({stand_in['errors']} injected errors)")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+        record = {
+            'revision': git_revision(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': sys.version.split()[0],
+            'params': params,
+            'metrics': metrics,
+            'stand_in': stand_in,
+        }
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        print(f"[*] Results appended to {os.path.relpath(args.results, ROOT)}")
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
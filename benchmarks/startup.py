@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget check for the CLI
+
+Runs `main.py --help` and a full `main.py --test --email` lookup (against
+benchmarks/mock_server.py, so no real service is contacted) in fresh
+interpreters, reports the median wall time and fails when a command is
+over its budget or imports one of the heavy modules that must stay lazy.
+
+    python benchmarks/startup.py [--runs 5] [--budget 0.3] [--run-budget 2.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockServer, MockSettings  # noqa: E402
+
+# Modules that must not be imported unless a run actually uses them
+LAZY_MODULES = ['openai', 'google.generativeai', 'duckduckgo_search', 'rich', 'requests']
+# A test-mode lookup renders with rich and calls the sources with requests,
+# but never needs an AI SDK or the DuckDuckGo client (the mock answers searches)
+RUN_LAZY_MODULES = ['openai', 'google.generativeai', 'duckduckgo_search']
+
+# name: (arguments, modules that must stay lazy, which budget applies)
+COMMANDS = {
+    '--help': ([MAIN, '--help'], LAZY_MODULES, 'budget'),
+    '--test --email': ([MAIN, '--test', '--no-daemon', '--email', 'bench@corp.example'], RUN_LAZY_MODULES, 'run_budget'),
+}
+
+
+def measure(args, runs, env=None):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True, env=env)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def imported_modules(args, env=None):
+    """Top-level module names imported by a command, via -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT, capture_output=True, text=True,
+                            env=env)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI cold-start time against a budget")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per command (default: 5)")
+    parser.add_argument('--budget', type=float, default=0.3, help="Median seconds allowed for --help (default: 0.3)")
+    parser.add_argument('--run-budget', type=float, default=2.0,
+                        help="Median seconds allowed for a test-mode lookup against the mock server (default: 2.0)")
+    args = parser.parse_args()
+
+    baseline = measure(['-c', 'pass'], args.runs)
+    print(f"python -c pass: {baseline * 1000:.0f} ms")
+
+    failed = False
+    with MockServer(MockSettings(latency=0.0, jitter=0.0)) as server, tempfile.TemporaryDirectory() as tmp:
+        # Point the lookup at the mock server; searches are paced by the
+        # mock, not by DuckDuckGo's real rate limit
+        config_file = os.path.join(tmp, 'config.json')
+        with open(config_file, 'w') as f:
+            json.dump(server.config(tmp, duckduckgo_rate=50, duckduckgo_burst=10), f)
+        env = dict(os.environ, DATA_GATHER_CONFIG=config_file)
+
+        for name, (command, lazy, budget_name) in COMMANDS.items():
+            budget = getattr(args, budget_name)
+            median = measure(command, args.runs, env)
+            leaked = [m for m in lazy if m in imported_modules(command, env)]
+            ok = median <= budget and not leaked
+            failed |= not ok
+            status = 'ok' if ok else 'OVER BUDGET'
+            print(f"main.py {name}: {median * 1000:.0f} ms (budget {budget * 1000:.0f} ms) {status}")
+            if leaked:
+                print(f"  eagerly imported: {', '.join(leaked)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
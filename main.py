@@ -1,39 +1,263 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
-from utils import email_lookup, name_lookup
-from utils.ai_analyzer import AIAnalyzer
-from utils.gemini_analyzer import GeminiAnalyzer
+import sys
+
+# Lookup modules, analyzers and their SDKs are imported inside main() only
+# when a run needs them, which keeps `--help` and `--test` start-up fast.
+
+async def print_stream(chunks):
+    """Print an analysis chunk by chunk as it is generated"""
+    async for chunk in chunks:
+        print(chunk, end='', flush=True)
+    print()
+
+
+async def run_via_daemon(daemon, args):
+    """Send the lookups to a running daemon and render its answers locally"""
+    print("[*] Using running data-gather daemon")
+    findings = {}
+
+    if args.email:
+        from utils.email_lookup import is_valid_email
+        from utils.models import EmailReport
+        from utils import report_renderer
+        print(f"[*] Looking up email: {args.email}")
+        if not is_valid_email(args.email):
+            print("[!] Invalid email format provided")
+        else:
+            report = await daemon.lookup_email(args.email, use_cache=not args.no_cache, refresh=args.refresh)
+            report_renderer.render_report(EmailReport.from_dict(report))
+            findings['email'] = report
+    if args.name:
+        from utils.models import SourceResult
+        from utils import report_renderer
+        print(f"[*] Looking up name: {args.name}")
+        result = await daemon.search_name(args.name, args.email, args.organization,
+                                         use_cache=not args.no_cache, refresh=args.refresh)
+        report_renderer.render_result(SourceResult.from_dict(result))
+        findings['name'] = result
+
+    if findings:
+        print(f"\n[*] AI Analysis of findings (using {args.ai}):")
+        await print_stream(daemon.stream_analysis(findings, args.ai, args.test,
+                                                  use_cache=not args.no_cache, refresh=args.refresh))
+
 
 async def main():
     parser = argparse.ArgumentParser(description="Simple OSINT Tool")
     parser.add_argument("--email", help="Target email address")
     parser.add_argument("--name", help="Target full name")
+    parser.add_argument("--organization", help="Organization the person is associated with (narrows the name search)")
     parser.add_argument("--test", action="store_true", help="Run in test mode without API calls")
     parser.add_argument(
         "--ai", 
-        choices=['openai', 'gemini'],
+        choices=['openai', 'gemini', 'fastest', 'both'],  # keep in sync with utils.analyzers
         default='openai',
-        help="Choose AI service for analysis (default: openai)"
+        help="Choose AI service for analysis: a provider, 'fastest' (first good answer) "
+             "or 'both' (merged answers) (default: openai)"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local response cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached answers and fetch fresh data")
+    parser.add_argument("--rescan", action="store_true",
+                        help="Only re-query sources whose last answer is stale and report what changed")
+    parser.add_argument("--input-file", help="Audit a CSV/newline list of your organization's own addresses")
+    parser.add_argument("--output", help="JSONL output for --input-file (default: <input>.results.jsonl)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent lookups for --input-file (default: 4)")
+    parser.add_argument("--no-daemon", action="store_true", help="Run in-process even if a daemon is running")
+    parser.add_argument(
+        "--format",
+        choices=['text', 'ndjson'],
+        default='text',
+        help="'ndjson' prints one JSON event per line as each source finishes, without Rich output (default: text)"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Stop sources still running after this many seconds and continue with what was collected"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="data-gather-trace.json",
+        metavar="TRACE_FILE",
+        help="Print where the time went and write a Chrome trace (default: data-gather-trace.json)"
     )
     args = parser.parse_args()
 
+    if args.format == 'ndjson':
+        from utils.events import disable_rich
+        disable_rich()
+
+    # The first Ctrl-C stops the running sources and keeps what they found
+    from utils.deadline import Deadline, handle_interrupts
+    args.run_deadline = Deadline(args.deadline)
+    handle_interrupts(
+        args.run_deadline,
+        on_interrupt=lambda: print("\n[!] Interrupted: finishing with the results collected so far "
+                                   "(Ctrl-C again to quit)", file=sys.stderr),
+        fallback=asyncio.current_task().cancel,
+    )
+
+    if args.profile:
+        from utils.tracing import print_summary, tracer
+        tracer.enable()
+        # Keep stdout parseable in headless runs
+        out = sys.stderr if args.format == 'ndjson' else sys.stdout
+        try:
+            with tracer.span('run', 'run'):
+                await run(args)
+        finally:
+            from rich.console import Console
+            print_summary(Console(file=out))
+            tracer.export(args.profile)
+            print(f"[*] Trace written to {args.profile} (open in chrome://tracing or ui.perfetto.dev)", file=out)
+    else:
+        await run(args)
+
+
+async def run(args):
+
+    if args.input_file:
+        from utils import bulk_audit
+        from utils.config import load_config
+        try:
+            await bulk_audit.run_bulk_audit(
+                args.input_file, args.output, load_config(), workers=args.workers,
+                use_cache=not args.no_cache, refresh=args.refresh, rescan=args.rescan
+            )
+        except bulk_audit.AuthorizationError as e:
+            print(f"[!] Bulk audit refused: {e}")
+            raise SystemExit(1)
+        return
+
+    if not (args.email or args.name):
+        return
+
+    if args.format == 'ndjson':
+        await run_headless(args)
+        return
+
+    # Profiling, deadlines and rescans need the work to happen in this process
+    if not (args.no_daemon or args.profile or args.deadline or args.rescan):
+        from utils.daemon import find_daemon
+        daemon = await find_daemon()
+        if daemon is not None:
+            await run_via_daemon(daemon, args)
+            return
+
     findings = {}
     # Initialize the appropriate analyzer based on the --ai flag
-    analyzer = GeminiAnalyzer(test_mode=args.test) if args.ai == 'gemini' else AIAnalyzer(test_mode=args.test)
+    from utils.analyzers import create_analyzer
+    analyzer = create_analyzer(args.ai, test_mode=args.test, use_cache=not args.no_cache, refresh=args.refresh)
 
+    lookups = {}
     if args.email:
+        from utils import email_lookup
         print(f"[*] Looking up email: {args.email}")
-        findings['email'] = email_lookup.search_by_email(args.email)
+        lookups['email'] = email_lookup.search_by_email_async(
+            args.email, use_cache=not args.no_cache, refresh=args.refresh, deadline=args.run_deadline,
+            rescan=args.rescan
+        )
     if args.name:
         print(f"[*] Looking up name: {args.name}")
-        findings['name'] = name_lookup.search_by_name(args.name)
+        lookups['name'] = lookup_name(args)
+    # The name search only shares DuckDuckGo with the email lookup, so it
+    # runs alongside the email's other sources instead of after them
+    results = dict(zip(lookups, await asyncio.gather(*lookups.values())))
+
+    if results.get('email') is not None:
+        findings['email'] = results['email'].to_dict()
+    if results.get('name') is not None:
+        from utils import report_renderer
+        report_renderer.render_result(results['name'])
+        findings['name'] = results['name'].to_dict()
 
     if findings:
         print(f"\n[*] AI Analysis of findings (using {args.ai}):")
-        analysis = await analyzer.analyze_findings(findings)
-        print(analysis)
+        await print_stream(analyzer.stream_analysis(findings))
+
+
+async def lookup_name(args, events=None):
+    """Name search run like a source, so --deadline, budgets and Ctrl-C apply to it
+
+    The email address (when given) and --organization narrow the name
+    variants down to the right person. Returns a SourceResult, or None if
+    the search failed outright.
+    """
+    from utils import name_lookup
+    from utils.config import load_config
+    from utils.deadline import DeadlineExceeded
+    from utils.models import SourceResult
+    from utils.source_engine import SourceEngine, SourceJob
+
+    config = load_config()
+    job = SourceJob('name', 'Name search', name_lookup.search_by_name,
+                    (args.name, args.email, args.organization, config))
+    results = await SourceEngine().run([job], events=events, deadline=args.run_deadline,
+                                       budgets=config.get('source_budgets'))
+    result = results['name']
+    if isinstance(result, DeadlineExceeded):
+        return SourceResult.stopped('name', str(result))
+    if isinstance(result, Exception):
+        if events is None:
+            print(f"[!] Name lookup failed: {result}")
+        return None
+    return result
+
+
+async def run_headless(args):
+    """--format ndjson: per-source events on stdout, then the analysis and a summary"""
+    import time
+    from utils.analyzers import create_analyzer
+    from utils.events import EventStream
+
+    events = EventStream()
+    events.emit('run', email=args.email, name=args.name, ai=args.ai)
+    findings = {}
+    analyzer = create_analyzer(args.ai, test_mode=args.test, use_cache=not args.no_cache, refresh=args.refresh)
+
+    lookups = {}
+    if args.email:
+        from utils import email_lookup
+        lookups['email'] = email_lookup.search_by_email_async(
+            args.email, use_cache=not args.no_cache, refresh=args.refresh, events=events,
+            deadline=args.run_deadline, rescan=args.rescan
+        )
+    if args.name:
+        lookups['name'] = lookup_name(args, events)
+    results = dict(zip(lookups, await asyncio.gather(*lookups.values())))
+
+    report = results.get('email')
+    if report is not None:
+        findings['email'] = report.to_dict()
+        if report.changes is not None:
+            events.emit('changes', changes=report.changes.to_dict())
+    if results.get('name') is not None:
+        findings['name'] = results['name'].to_dict()
+
+    analysis = None
+    if findings:
+        events.emit('start', source='analysis', ai=args.ai)
+        start = time.perf_counter()
+        analysis = ''.join([chunk async for chunk in analyzer.stream_analysis(findings)])
+        events.emit('analysis', ai=args.ai, text=analysis)
+        events.emit('timing', source='analysis', elapsed=round(time.perf_counter() - start, 3))
+
+    changes = report.changes.counts() if report is not None and report.changes is not None else {}
+    events.summary(report, analysis=analysis is not None, **changes)
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if sys.argv[1:2] == ['serve']:
+        # data-gather serve [--socket PATH | --port N]
+        from utils import daemon
+        daemon.main(sys.argv[2:])
+    else:
+        try:
+            asyncio.run(main())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print("\n[!] Interrupted", file=sys.stderr)
+            sys.exit(130)
 
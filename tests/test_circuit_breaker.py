@@ -0,0 +1,23 @@
+import pytest
+
+from utils.circuit_breaker import CLOSED, CircuitBreakers
+from utils.deadline import DeadlineExceeded
+from utils.email_lookup import EmailOSINT
+
+
+def test_deadline_stop_leaves_breaker_closed(tmp_path):
+    osint = EmailOSINT(config={})
+    osint.breakers = CircuitBreakers(str(tmp_path / 'breakers.db'))
+
+    def stopped(email):
+        raise DeadlineExceeded('deadline reached')
+
+    check = osint._guarded('duckduckgo', 'breach_directory', stopped)
+    for _ in range(osint.breakers.settings['failure_threshold'] + 1):
+        with pytest.raises(DeadlineExceeded):
+            check('someone@example.com')
+
+    state = osint.breakers.status('duckduckgo')
+    assert state['state'] == CLOSED
+    assert state['failures'] == 0
+    assert osint.breakers.allow('duckduckgo')
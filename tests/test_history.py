@@ -0,0 +1,48 @@
+import asyncio
+
+from utils import deadline as deadlines
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.history import FindingsHistory, diff_results
+from utils.models import FOUND, CredentialLeak, EmailReport, SourceResult
+from utils.source_engine import SourceEngine, SourceJob
+
+EMAIL = 'someone@example.com'
+
+
+def credentials(count):
+    return [CredentialLeak(f'db{i}', 'dehashed', username=f'user{i}') for i in range(count)]
+
+
+def paging_check(email):
+    """Collect one credential per page until the deadline stops the paging"""
+    result = SourceResult('dehashed', status=FOUND)
+    for leak in credentials(10):
+        try:
+            deadlines.sleep(0.05)
+        except DeadlineExceeded:
+            break
+        result.credentials.append(leak)
+    result.total = len(result.credentials)
+    return result
+
+
+def test_truncated_run_leaves_history_unchanged(tmp_path):
+    history = FindingsHistory(str(tmp_path / 'history.db'))
+    baseline = EmailReport(EMAIL)
+    baseline.add(SourceResult('dehashed', status=FOUND, total=10, credentials=credentials(10)))
+    history.save(baseline)
+
+    engine = SourceEngine()
+    results = asyncio.run(engine.run([SourceJob('dehashed', 'DeHashed', paging_check, (EMAIL,))],
+                                     deadline=Deadline(0.2)))
+    truncated = results['dehashed']
+    assert truncated.truncated and 0 < len(truncated.credentials) < 10
+
+    report = EmailReport(EMAIL)
+    report.add(truncated)
+    history.save(report)
+
+    stored = history.load(EMAIL)['dehashed']['result']
+    assert stored.total == 10 and len(stored.credentials) == 10
+    diff = diff_results(EMAIL, {'dehashed': stored}, report.results)
+    assert not diff.changed
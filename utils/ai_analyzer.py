@@ -1,26 +1,5 @@
-import os
-import json
-from openai import AsyncOpenAI
-from typing import Dict, Any
-from rich.console import Console
-
-console = Console()
-
-def load_config():
-    """Load configuration from config file"""
-    config = {}
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, '..', 'config.json')
-
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-    except FileNotFoundError:
-        console.print("[yellow]⚠ No config.json found. OpenAI analysis will be disabled.[/yellow]")
-    except Exception as e:
-        console.print(f"[red]✗ Error loading config: {str(e)}[/red]")
-
-    return config
+from typing import AsyncIterator, Dict, Any
+from utils.analyzers import BaseAnalyzer
 
 def get_mock_analysis(data: Dict[str, Any]) -> str:
     """Provide a mock analysis for testing purposes"""
@@ -40,44 +19,37 @@ def get_mock_analysis(data: Dict[str, Any]) -> str:
 - Verify your API quota and billing
 - Review collected data manually"""
 
-class AIAnalyzer:
-    def __init__(self, test_mode=True):
-        self.config = load_config()
-        self.api_key = self.config.get('openai_api_key')
-        self.test_mode = test_mode
-        
-        if not self.api_key and not self.test_mode:
-            raise ValueError("OpenAI API key not found in config.json")
-            
-        if not self.test_mode:
-            self.client = AsyncOpenAI(api_key=self.api_key)
-
-    async def analyze_findings(self, data: Dict[str, Any]) -> str:
-        """Analyze OSINT findings using GPT or fallback to mock analysis"""
-        if self.test_mode:
-            console.print("[yellow]⚠ Running in test mode - using mock analysis[/yellow]")
-            return get_mock_analysis(data)
-            
-        prompt = self._create_analysis_prompt(data)
-        
-        try:
-            response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an OSINT analysis assistant. Analyze the provided data and give insights."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            console.print(f"[red]✗ OpenAI API call failed: {str(e)}[/red]")
-            console.print("[yellow]ℹ Falling back to mock analysis[/yellow]")
-            return get_mock_analysis(data)
+class AIAnalyzer(BaseAnalyzer):
+    PROVIDER = 'openai'
+    LABEL = 'OpenAI'
+    DEFAULT_MODEL = 'gpt-3.5-turbo'
+    mock_analysis = staticmethod(get_mock_analysis)
+
+    def _setup_client(self):
+        # Imported here so test runs and other analyzers never load the SDK
+        from openai import AsyncOpenAI
+        # openai_base_url points at an OpenAI-compatible server (proxy, benchmark stand-in)
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.config.get('openai_base_url'))
+
+    async def _stream_completion(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are an OSINT analysis assistant. Analyze the provided data and give insights."},
+                {"role": "user", "content": prompt}
+            ],
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
     def _create_analysis_prompt(self, data: Dict[str, Any]) -> str:
+        prompt_data = self._prompt_data(data)
         return f"""Please analyze the following OSINT data and provide key insights:
         
-Data collected: {data}
+Data collected ({prompt_data.summary()}, compact JSON):
+{prompt_data.text}
 
 Please provide:
 1. Key findings
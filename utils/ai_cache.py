@@ -0,0 +1,54 @@
+import os
+from typing import Any, Dict, Optional
+
+from utils.cache import DAY, ResponseCache, default_cache_dir
+from utils.prompt_builder import findings_digest
+
+DEFAULT_AI_CACHE_TTL = 7 * DAY
+DEFAULT_AI_CACHE_MAX_ENTRIES = 500
+
+
+class AnalysisCache:
+    """
+    On-disk cache of AI analyses, shared by every analyzer
+
+    Entries are keyed by a hash of the normalized findings plus the provider,
+    model, prompt template version and token budget, so any change to what
+    would be sent produces a new analysis. Analyses live in their own
+    database so their size limit does not compete with source answers.
+    """
+
+    SOURCE = 'ai'
+
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_AI_CACHE_TTL,
+                 max_entries: int = DEFAULT_AI_CACHE_MAX_ENTRIES, enabled: bool = True, refresh: bool = False):
+        self._cache = ResponseCache(
+            path=path or os.path.join(default_cache_dir(), 'ai-cache.db'),
+            ttls={self.SOURCE: ttl},
+            max_entries=max_entries,
+            enabled=enabled,
+            refresh=refresh,
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], enabled: bool = True, refresh: bool = False) -> 'AnalysisCache':
+        cache_dir = config.get('cache_dir') or default_cache_dir()
+        return cls(
+            path=os.path.join(cache_dir, 'ai-cache.db'),
+            ttl=config.get('ai_cache_ttl', DEFAULT_AI_CACHE_TTL),
+            max_entries=config.get('ai_cache_max_entries', DEFAULT_AI_CACHE_MAX_ENTRIES),
+            enabled=enabled and not config.get('disable_cache', False),
+            refresh=refresh,
+        )
+
+    @staticmethod
+    def key(findings: Dict[str, Any], provider: str, model: str, prompt_version: int, token_budget: int) -> str:
+        return f"{provider}:{model}:v{prompt_version}:{token_budget}|{findings_digest(findings)}"
+
+    def get(self, key: str) -> Optional[str]:
+        endpoint, digest = key.split('|', 1)
+        return self._cache.get(self.SOURCE, endpoint, digest)
+
+    def set(self, key: str, analysis: str):
+        endpoint, digest = key.split('|', 1)
+        self._cache.set(self.SOURCE, endpoint, digest, analysis)
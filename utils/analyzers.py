@@ -0,0 +1,251 @@
+import asyncio
+import importlib
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict
+
+from rich.console import Console
+
+from utils.ai_cache import AnalysisCache
+from utils.config import load_config
+from utils.prompt_builder import compact_findings, token_budget_for
+from utils.tracing import span
+
+console = Console()
+
+# AI providers, imported only when selected
+ANALYZERS = {
+    'openai': ('utils.ai_analyzer', 'AIAnalyzer'),
+    'gemini': ('utils.gemini_analyzer', 'GeminiAnalyzer'),
+}
+# Modes combining every configured provider
+MULTI_MODES = ('fastest', 'both')
+# Seconds 'fastest' waits for the first provider before asking the next one
+DEFAULT_HEDGE_DELAY = 1.5
+
+
+def create_analyzer(provider, test_mode=True, use_cache=True, refresh=False):
+    """Import and build the analyzer for a provider (or a multi-provider mode)"""
+    if provider in MULTI_MODES:
+        return MultiAnalyzer(provider, test_mode=test_mode, use_cache=use_cache, refresh=refresh)
+    module_name, class_name = ANALYZERS[provider]
+    analyzer_class = getattr(importlib.import_module(module_name), class_name)
+    return analyzer_class(test_mode=test_mode, use_cache=use_cache, refresh=refresh)
+
+
+class BaseAnalyzer(ABC):
+    """
+    Shared flow of the AI analyzers: prompt budget, result cache, streaming
+    and the mock fallback. Providers implement _setup_client,
+    _stream_completion and _create_analysis_prompt.
+    """
+
+    PROVIDER = ''
+    LABEL = ''
+    DEFAULT_MODEL = ''
+    # Bump when the prompt template changes so cached analyses are not reused
+    PROMPT_VERSION = 2
+    mock_analysis: Callable[[Dict[str, Any]], str]
+
+    def __init__(self, test_mode=True, use_cache=True, refresh=False):
+        self.config = load_config()
+        self.api_key = self.config.get(f'{self.PROVIDER}_api_key')
+        self.test_mode = test_mode
+        self.model_name = self.config.get(f'{self.PROVIDER}_model', self.DEFAULT_MODEL)
+        self.token_budget = token_budget_for(self.model_name, self.config)
+        self.cache = AnalysisCache.from_config(self.config, enabled=use_cache, refresh=refresh)
+
+        if not self.api_key and not self.test_mode:
+            raise ValueError(f"{self.LABEL} API key not found in config.json")
+
+        if not self.test_mode:
+            self._setup_client()
+
+    @abstractmethod
+    def _setup_client(self):
+        """Create the provider's SDK client (not called in test mode)"""
+
+    @abstractmethod
+    def _stream_completion(self, prompt: str) -> AsyncIterator[str]:
+        """Async generator yielding the provider's answer chunk by chunk; raises on any failure"""
+
+    @abstractmethod
+    def _create_analysis_prompt(self, data: Dict[str, Any]) -> str:
+        """Prompt sent to the provider for the findings"""
+
+    def _prompt_data(self, data: Dict[str, Any]):
+        prompt_data = compact_findings(data, self.token_budget)
+        if prompt_data.complete:
+            console.print(f"[dim]Prompt: {prompt_data.summary()}[/dim]")
+        else:
+            console.print(f"[cyan]ℹ Prompt trimmed to the token budget: {prompt_data.summary()}[/cyan]")
+        return prompt_data
+
+    def _cached(self, data: Dict[str, Any]):
+        cache_key = self.cache.key(data, self.PROVIDER, self.model_name, self.PROMPT_VERSION, self.token_budget)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            console.print("[green]✓ Analysis loaded from cache[/green] [dim](same findings, model and prompt)[/dim]")
+        return cache_key, cached
+
+    async def stream_analysis(self, data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Yield the analysis as it is generated
+
+        If the provider fails, even partway through, the mock analysis is
+        yielded after what was already received.
+        """
+        if self.test_mode:
+            console.print("[yellow]⚠ Running in test mode - using mock analysis[/yellow]")
+            yield self.mock_analysis(data)
+            return
+
+        started = time.perf_counter()
+        with span(f"{self.LABEL} analysis", 'ai', model=self.model_name, stream=True) as current:
+            cache_key, cached = self._cached(data)
+            if cached is not None:
+                current.set(status='cached', bytes=len(cached))
+                yield cached
+                return
+
+            prompt = self._create_analysis_prompt(data)
+            parts = []
+            try:
+                async for chunk in self._stream_completion(prompt):
+                    if not parts:
+                        current.set(first_chunk=round(time.perf_counter() - started, 3))
+                    parts.append(chunk)
+                    yield chunk
+            except Exception as e:
+                current.set(status='error', error=str(e), bytes=sum(len(part) for part in parts))
+                if parts:
+                    yield '\n\n'
+                console.print(f"[red]✗ {self.LABEL} API call failed: {str(e)}[/red]")
+                console.print("[yellow]ℹ Falling back to mock analysis[/yellow]")
+                yield self.mock_analysis(data)
+                return
+            analysis = ''.join(parts)
+            current.set(status='ok', bytes=len(analysis))
+            self.cache.set(cache_key, analysis)
+
+    async def complete(self, data: Dict[str, Any]) -> str:
+        """Full analysis from the provider (or the cache); raises instead of falling back"""
+        with span(f"{self.LABEL} analysis", 'ai', model=self.model_name) as current:
+            cache_key, cached = self._cached(data)
+            if cached is not None:
+                current.set(status='cached', bytes=len(cached))
+                return cached
+            prompt = self._create_analysis_prompt(data)
+            analysis = ''.join([chunk async for chunk in self._stream_completion(prompt)])
+            if not analysis.strip():
+                raise ValueError(f"{self.LABEL} returned an empty analysis")
+            current.set(status='ok', bytes=len(analysis))
+            self.cache.set(cache_key, analysis)
+            return analysis
+
+    async def analyze_findings(self, data: Dict[str, Any]) -> str:
+        """Analyze OSINT findings or fall back to the mock analysis"""
+        if self.test_mode:
+            console.print("[yellow]⚠ Running in test mode - using mock analysis[/yellow]")
+            return self.mock_analysis(data)
+
+        try:
+            return await self.complete(data)
+        except Exception as e:
+            console.print(f"[red]✗ {self.LABEL} API call failed: {str(e)}[/red]")
+            console.print("[yellow]ℹ Falling back to mock analysis[/yellow]")
+            return self.mock_analysis(data)
+
+
+class MultiAnalyzer:
+    """
+    Ask several providers at once
+
+    'fastest' starts the providers one hedge delay apart (or right away once
+    one fails) and keeps the first good answer, cancelling the others.
+    'both' waits for every provider and merges their answers. The mock
+    analysis is only used when no real provider answers.
+    """
+
+    def __init__(self, mode='fastest', test_mode=True, use_cache=True, refresh=False, providers=None):
+        self.config = load_config()
+        self.mode = mode
+        self.test_mode = test_mode
+        self.hedge_delay = float(self.config.get('ai_hedge_delay', DEFAULT_HEDGE_DELAY))
+        self.analyzers = []
+        for provider in providers or self.config.get('ai_providers') or list(ANALYZERS):
+            try:
+                self.analyzers.append(create_analyzer(provider, test_mode=test_mode,
+                                                      use_cache=use_cache, refresh=refresh))
+            except (KeyError, ValueError) as e:
+                console.print(f"[yellow]⚠ Skipping AI provider {provider}: {str(e)}[/yellow]")
+        if not self.analyzers:
+            raise ValueError("No AI provider is configured in config.json")
+
+    def mock_analysis(self, data: Dict[str, Any]) -> str:
+        return self.analyzers[0].mock_analysis(data)
+
+    async def _hedged(self, analyzer, data, delay, failed: asyncio.Event):
+        if delay > 0:
+            try:
+                await asyncio.wait_for(failed.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        try:
+            return analyzer, await analyzer.complete(data)
+        except Exception as e:
+            console.print(f"[red]✗ {analyzer.LABEL} API call failed: {str(e)}[/red]")
+            failed.set()
+            raise
+
+    async def _fastest(self, data: Dict[str, Any]) -> str:
+        failed = asyncio.Event()
+        tasks = [
+            asyncio.create_task(self._hedged(analyzer, data, index * self.hedge_delay, failed))
+            for index, analyzer in enumerate(self.analyzers)
+        ]
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        analyzer, analysis = task.result()
+                        console.print(f"[green]✓ Using the {analyzer.LABEL} analysis[/green] [dim](first to answer)[/dim]")
+                        return analysis
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        raise ValueError("every AI provider failed")
+
+    async def _both(self, data: Dict[str, Any]) -> str:
+        results = await asyncio.gather(*(analyzer.complete(data) for analyzer in self.analyzers),
+                                       return_exceptions=True)
+        sections = []
+        for analyzer, result in zip(self.analyzers, results):
+            if isinstance(result, Exception):
+                console.print(f"[red]✗ {analyzer.LABEL} API call failed: {str(result)}[/red]")
+            else:
+                sections.append(f"=== {analyzer.LABEL} ({analyzer.model_name}) ===\n{result.strip()}")
+        if not sections:
+            raise ValueError("every AI provider failed")
+        return '\n\n'.join(sections)
+
+    async def analyze_findings(self, data: Dict[str, Any]) -> str:
+        """Analyze OSINT findings with every provider or fall back to the mock analysis"""
+        if self.test_mode:
+            return await self.analyzers[0].analyze_findings(data)
+
+        try:
+            if self.mode == 'both':
+                return await self._both(data)
+            return await self._fastest(data)
+        except Exception as e:
+            console.print(f"[red]✗ {str(e)}[/red]")
+            console.print("[yellow]ℹ Falling back to mock analysis[/yellow]")
+            return self.mock_analysis(data)
+
+    async def stream_analysis(self, data: Dict[str, Any]) -> AsyncIterator[str]:
+        """The winning or merged analysis is only known once complete, so it is yielded whole"""
+        yield await self.analyze_findings(data)
@@ -0,0 +1,200 @@
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, Optional
+
+from rich.console import Console
+
+from utils.cache import ResponseCache, StateStore, connect
+from utils.email_lookup import EmailOSINT, is_valid_email
+from utils.source_engine import SourceEngine
+
+console = Console()
+
+DEFAULT_WORKERS = 4
+
+
+class AuthorizationError(Exception):
+    """Raised when bulk mode is used without an explicit scope acknowledgment"""
+
+
+def check_authorization(config: Dict) -> Dict:
+    """
+    Make sure the operator acknowledged what they are allowed to audit
+
+    config.json must contain a bulk_audit section such as:
+        {"authorized": true,
+         "scope": "Post-breach exposure review of our staff addresses",
+         "allowed_domains": ["example.com"]}
+    """
+    audit = config.get('bulk_audit') or {}
+    if audit.get('authorized') is not True:
+        raise AuthorizationError("bulk_audit.authorized must be set to true in config.json")
+    if not str(audit.get('scope', '')).strip():
+        raise AuthorizationError("bulk_audit.scope must describe the authorized audit in config.json")
+    domains = [d.lower().lstrip('@') for d in audit.get('allowed_domains') or []]
+    if not domains:
+        raise AuthorizationError("bulk_audit.allowed_domains must list the domains you own in config.json")
+    return {'scope': audit['scope'], 'allowed_domains': set(domains)}
+
+
+def in_scope(email: str, allowed_domains) -> bool:
+    domain = email.rsplit('@', 1)[-1].lower()
+    return any(domain == d or domain.endswith('.' + d) for d in allowed_domains)
+
+
+def read_addresses(path: str) -> Iterator[str]:
+    """
+    Lazily yield addresses from a newline list or a CSV file
+
+    The first field of each row that looks like an email address is used,
+    so header rows and extra columns are skipped.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            for field in row:
+                field = field.strip()
+                if '@' in field:
+                    yield field
+                    break
+
+
+class Checkpoint:
+    """Addresses already written to the output, kept on disk so memory stays flat"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = connect(path)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS done (email TEXT PRIMARY KEY, status TEXT, finished_at REAL)')
+
+    def __contains__(self, email: str) -> bool:
+        # Errors recorded by older versions are retried too
+        return self._conn.execute("SELECT 1 FROM done WHERE email = ? AND status != 'error'",
+                                  (email.lower(),)).fetchone() is not None
+
+    def mark(self, email: str, status: str):
+        self._conn.execute('INSERT OR REPLACE INTO done VALUES (?, ?, ?)', (email.lower(), status, time.time()))
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM done WHERE status != 'error'").fetchone()[0]
+
+    def close(self):
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
+
+async def run_bulk_audit(input_path: str, output_path: Optional[str] = None, config: Optional[Dict] = None,
+                         workers: int = DEFAULT_WORKERS, use_cache: bool = True, refresh: bool = False,
+                         rescan: bool = False) -> Dict:
+    """
+    Audit a list of the organization's own addresses
+
+    Addresses are read lazily and fed to a bounded pool of workers sharing
+    one EmailOSINT, so every source keeps its own concurrency limit and the
+    DuckDuckGo rate limit applies across the whole run. Each finished
+    address is appended to the JSONL output right away and recorded in a
+    checkpoint, so an interrupted run resumes where it stopped; addresses
+    whose lookup failed are not recorded and are retried then. With rescan,
+    only sources with stale answers are queried and each record carries the
+    changes since the address was last audited.
+
+    Returns:
+        dict: Counters for the run (done, skipped, out_of_scope, invalid, errors)
+    """
+    config = config or {}
+    authorization = check_authorization(config)
+    output_path = output_path or os.path.splitext(input_path)[0] + '.results.jsonl'
+    checkpoint = Checkpoint(output_path + '.checkpoint')
+
+    osint_tool = EmailOSINT(
+        engine=SourceEngine(config.get('source_concurrency')),
+        cache=ResponseCache.from_config(config, enabled=use_cache, refresh=refresh),
+        state=StateStore.from_config(config),
+    )
+    workers = max(1, int(workers))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    stats = {'done': 0, 'skipped': 0, 'out_of_scope': 0, 'invalid': 0, 'errors': 0}
+    # Addresses queued or running; never larger than the queue plus the workers
+    in_flight = set()
+
+    console.print(f"[bold green]🎯 Bulk audit:[/bold green] {authorization['scope']}")
+    console.print(f"[dim]Scope: {', '.join(sorted(authorization['allowed_domains']))} — "
+                  f"{workers} workers — output: {output_path}[/dim]")
+    if checkpoint.count():
+        console.print(f"[cyan]ℹ Resuming: {checkpoint.count()} address(es) already audited[/cyan]")
+
+    with open(output_path, 'a', encoding='utf-8') as out:
+
+        def write(email, status, report=None, error=None, done=True):
+            record = {'email': email, 'status': status, 'finished_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+            if report is not None:
+                record['report'] = report.to_dict()
+            if error:
+                record['error'] = error
+            out.write(json.dumps(record, separators=(',', ':')) + '\n')
+            out.flush()
+            if done:
+                checkpoint.mark(email, status)
+            in_flight.discard(email.lower())
+
+        async def worker():
+            while True:
+                email = await queue.get()
+                try:
+                    if email is None:
+                        return
+                    try:
+                        report = await osint_tool.collect_async(email, config, show_progress=False, rescan=rescan)
+                    except Exception as e:
+                        stats['errors'] += 1
+                        # Left out of the checkpoint, so a resumed run tries it again
+                        write(email, 'error', error=str(e), done=False)
+                        console.print(f"[red]✗ {email}: {str(e)}[/red]")
+                        continue
+                    stats['done'] += 1
+                    write(email, 'ok', report)
+                    changed = ""
+                    if report.changes is not None and report.changes.changed:
+                        changed = (f" [red]+{len(report.changes.new_breaches)} breach(es), "
+                                   f"+{len(report.changes.new_hits)} hit(s) since last audit[/red]")
+                    console.print(f"[green]✓ {email}[/green] [dim]{len(report.breaches)} breach(es), "
+                                  f"{len(report.hits)} web hit(s)[/dim]{changed}")
+                finally:
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            for email in read_addresses(input_path):
+                if email.lower() in in_flight or email in checkpoint:
+                    stats['skipped'] += 1
+                    continue
+                if not is_valid_email(email):
+                    stats['invalid'] += 1
+                    write(email, 'invalid')
+                    continue
+                if not in_scope(email, authorization['allowed_domains']):
+                    stats['out_of_scope'] += 1
+                    write(email, 'out_of_scope')
+                    console.print(f"[yellow]⚠ {email} is outside the authorized scope, not checked[/yellow]")
+                    continue
+                # Blocks when the workers are busy, so the file is never read ahead
+                in_flight.add(email.lower())
+                await queue.put(email)
+
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            checkpoint.close()
+
+    console.print(f"\n[bold green]✅ Bulk audit finished[/bold green] "
+                  f"[dim]{stats['done']} audited, {stats['skipped']} already done, "
+                  f"{stats['out_of_scope']} out of scope, {stats['invalid']} invalid, {stats['errors']} errors[/dim]")
+    return stats
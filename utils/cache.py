@@ -0,0 +1,219 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# How long a cached answer stays valid, per source. Search engines change
+# quickly; breach databases are only updated every few days.
+DEFAULT_TTLS = {
+    'duckduckgo': 6 * HOUR,
+    'breach_directory': 6 * HOUR,
+    'gravatar': DAY,
+    'hibp': DAY,
+    'intelx': DAY,
+    'dehashed': DAY,
+    'leakcheck': DAY,
+}
+DEFAULT_TTL = 6 * HOUR
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def default_cache_dir() -> str:
+    """Directory holding the local cache database (next to config.json)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, '..', '.cache')
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a SQLite database that can be shared by threads and concurrent runs"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def normalize_target(target: str) -> str:
+    return ' '.join(str(target).split()).lower()
+
+
+class ResponseCache:
+    """On-disk TTL + LRU cache of source answers keyed by source, endpoint and target"""
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, int]] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True, refresh: bool = False):
+        self.path = path or os.path.join(default_cache_dir(), 'data-gather.db')
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        # refresh: never read from the cache, but store fresh answers
+        self.refresh = refresh
+        self._ready = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], enabled: bool = True, refresh: bool = False) -> 'ResponseCache':
+        cache_dir = config.get('cache_dir') or default_cache_dir()
+        return cls(
+            path=os.path.join(cache_dir, 'data-gather.db'),
+            ttls=config.get('cache_ttls'),
+            max_entries=config.get('cache_max_entries', DEFAULT_MAX_ENTRIES),
+            enabled=enabled and not config.get('disable_cache', False),
+            refresh=refresh,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.path)
+        if not self._ready:
+            conn.execute('''CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)')
+            self._ready = True
+        return conn
+
+    @staticmethod
+    def make_key(source: str, endpoint: str, target: str) -> str:
+        return f"{source}|{endpoint}|{normalize_target(target)}"
+
+    def ttl_for(self, source: str) -> int:
+        return int(self.ttls.get(source, DEFAULT_TTL))
+
+    def get(self, source: str, endpoint: str, target: str) -> Optional[Any]:
+        """Return the cached payload, or None when missing, expired or bypassed"""
+        if not self.enabled or self.refresh or self.ttl_for(source) <= 0:
+            return None
+
+        key = self.make_key(source, endpoint, target)
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT payload, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= now:
+                    conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    return None
+                conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+                return json.loads(row[0])
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError):
+            # A broken cache must never break a lookup
+            return None
+
+    def set(self, source: str, endpoint: str, target: str, payload: Any):
+        """Store a payload and evict the least recently used entries over the limit"""
+        ttl = self.ttl_for(source)
+        if not self.enabled or ttl <= 0:
+            return
+
+        key = self.make_key(source, endpoint, target)
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, source, json.dumps(payload, separators=(',', ':')), now, now + ttl, now)
+                )
+                conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+                conn.execute(
+                    '''DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )''',
+                    (self.max_entries,)
+                )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def clear(self, source: Optional[str] = None):
+        try:
+            conn = self._connect()
+            try:
+                if source:
+                    conn.execute('DELETE FROM responses WHERE source = ?', (source,))
+                else:
+                    conn.execute('DELETE FROM responses')
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+
+class StateStore:
+    """Small persistent key/value store for state shared across runs"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_cache_dir(), 'data-gather.db')
+        self._ready = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'StateStore':
+        cache_dir = config.get('cache_dir') or default_cache_dir()
+        return cls(os.path.join(cache_dir, 'data-gather.db'))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.path)
+        if not self._ready:
+            conn.execute('''CREATE TABLE IF NOT EXISTS state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL
+            )''')
+            self._ready = True
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT value, expires_at FROM state WHERE key = ?', (key,)).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return default
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value, separators=(',', ':')), now, now + ttl if ttl else None)
+                )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def delete(self, key: str):
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM state WHERE key = ?', (key,))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
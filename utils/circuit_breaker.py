@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from utils.cache import connect, default_cache_dir
+
+CLOSED = 'closed'          # calls go through
+OPEN = 'open'              # calls are skipped until the cooldown ends
+HALF_OPEN = 'half_open'    # one test call is let through to see if the source is back
+
+DEFAULTS = {
+    'failure_threshold': 3,     # consecutive failures that open the breaker
+    'failure_rate': 0.5,        # ... or this share of recent calls failing
+    'min_calls': 5,             # calls needed before the failure rate counts
+    'cooldown': 300,            # seconds open before the first test call
+    'max_cooldown': 3600,       # cooldown doubles after each failed test call, up to this
+    'probe_timeout': 120,       # a test call not reported back within this is retried
+}
+# Weight of the newest call in the failure rate (exponential moving average)
+RATE_WEIGHT = 0.2
+
+
+class CircuitBreakers:
+    """
+    Per-source circuit breakers stored in SQLite
+
+    State lives next to the response cache, so every run and every process
+    on the machine sees the same breakers: once a source has failed
+    repeatedly, later runs skip it straight away instead of paying for its
+    timeouts and retries again. After a cooldown a single half-open test
+    call decides whether it closes again or stays open for longer.
+    """
+
+    def __init__(self, path: Optional[str] = None, settings: Optional[Dict[str, Any]] = None,
+                 enabled: bool = True):
+        self.path = path or os.path.join(default_cache_dir(), 'data-gather.db')
+        self.settings = dict(DEFAULTS)
+        if settings:
+            self.settings.update(settings)
+        self.enabled = enabled
+        self._ready = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'CircuitBreakers':
+        cache_dir = config.get('cache_dir') or default_cache_dir()
+        settings = config.get('circuit_breaker')
+        return cls(
+            os.path.join(cache_dir, 'data-gather.db'),
+            settings=settings if isinstance(settings, dict) else None,
+            enabled=settings is not False,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.path)
+        if not self._ready:
+            conn.execute('''CREATE TABLE IF NOT EXISTS breakers (
+                name TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                failures INTEGER NOT NULL,
+                failure_rate REAL NOT NULL,
+                calls INTEGER NOT NULL,
+                cooldown REAL NOT NULL,
+                open_until REAL NOT NULL,
+                probe_until REAL NOT NULL,
+                last_error TEXT,
+                updated_at REAL NOT NULL
+            )''')
+            self._ready = True
+        return conn
+
+    def _update(self, name: str, change):
+        """Apply change(row) -> (row, answer) atomically across processes"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT * FROM breakers WHERE name = ?', (name,)).fetchone()
+                if row is None:
+                    row = (name, CLOSED, 0, 0.0, 0, float(self.settings['cooldown']), 0.0, 0.0, None, 0.0)
+                row = dict(zip(('name', 'state', 'failures', 'failure_rate', 'calls', 'cooldown',
+                                'open_until', 'probe_until', 'last_error', 'updated_at'), row))
+                row, answer = change(row)
+                row['updated_at'] = time.time()
+                conn.execute('INSERT OR REPLACE INTO breakers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             tuple(row.values()))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+        return answer
+
+    def allow(self, name: str) -> bool:
+        """True if a call to the source may go ahead (possibly as the half-open test call)"""
+        if not self.enabled:
+            return True
+
+        def change(row):
+            now = time.time()
+            if row['state'] == CLOSED:
+                return row, True
+            if row['state'] == OPEN and now < row['open_until']:
+                return row, False
+            if row['state'] == HALF_OPEN and now < row['probe_until']:
+                # Another run is already testing the source
+                return row, False
+            row['state'] = HALF_OPEN
+            row['probe_until'] = now + self.settings['probe_timeout']
+            return row, True
+
+        try:
+            return self._update(name, change)
+        except sqlite3.Error:
+            # A broken state database must never block a lookup
+            return True
+
+    def record(self, name: str, ok: bool, error: Optional[str] = None):
+        """Report the outcome of a call let through by allow()"""
+        if not self.enabled:
+            return
+        settings = self.settings
+
+        def change(row):
+            now = time.time()
+            row['calls'] += 1
+            row['failure_rate'] = (1 - RATE_WEIGHT) * row['failure_rate'] + RATE_WEIGHT * (0.0 if ok else 1.0)
+            if ok:
+                row['failures'] = 0
+                if row['state'] != CLOSED:
+                    row.update(state=CLOSED, failure_rate=0.0, calls=0, cooldown=float(settings['cooldown']),
+                               open_until=0.0, probe_until=0.0)
+                return row, None
+
+            row['failures'] += 1
+            row['last_error'] = (error or '')[:200] or None
+            if row['state'] == HALF_OPEN:
+                # Still down: wait longer before the next test call
+                row['cooldown'] = min(row['cooldown'] * 2, float(settings['max_cooldown']))
+                row.update(state=OPEN, open_until=now + row['cooldown'], probe_until=0.0)
+            elif row['state'] == CLOSED and (
+                    row['failures'] >= settings['failure_threshold']
+                    or (row['calls'] >= settings['min_calls'] and row['failure_rate'] >= settings['failure_rate'])):
+                row.update(state=OPEN, open_until=now + row['cooldown'])
+            return row, None
+
+        try:
+            self._update(name, change)
+        except sqlite3.Error:
+            pass
+
+    def release(self, name: str):
+        """Give up a half-open test call without an outcome (e.g. the run was stopped)"""
+        if not self.enabled:
+            return
+
+        def change(row):
+            if row['state'] == HALF_OPEN:
+                row['probe_until'] = 0.0
+            return row, None
+
+        try:
+            self._update(name, change)
+        except sqlite3.Error:
+            pass
+
+    def status(self, name: str) -> Dict[str, Any]:
+        """Current breaker state for a source (closed when never seen)"""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT state, failures, failure_rate, open_until, last_error '
+                                   'FROM breakers WHERE name = ?', (name,)).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            return {'state': CLOSED, 'failures': 0, 'failure_rate': 0.0, 'open_until': 0.0, 'last_error': None}
+        return dict(zip(('state', 'failures', 'failure_rate', 'open_until', 'last_error'), row))
+
+    def reset(self, name: Optional[str] = None):
+        try:
+            conn = self._connect()
+            try:
+                if name:
+                    conn.execute('DELETE FROM breakers WHERE name = ?', (name,))
+                else:
+                    conn.execute('DELETE FROM breakers')
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
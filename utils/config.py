@@ -0,0 +1,49 @@
+import json
+import os
+import threading
+
+_config = None
+_lock = threading.Lock()
+
+
+def config_path():
+    """Location of config.json (next to main.py, or $DATA_GATHER_CONFIG)"""
+    if os.environ.get('DATA_GATHER_CONFIG'):
+        return os.environ['DATA_GATHER_CONFIG']
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, '..', 'config.json')
+
+
+def _warn(message):
+    # rich is only imported when there is something to report
+    from rich.console import Console
+    Console(stderr=True).print(message)
+
+
+def load_config(reload=False):
+    """Load configuration from config file; it is only read and parsed once per process"""
+    global _config
+    with _lock:
+        if _config is not None and not reload:
+            return _config
+
+        config = {}
+        try:
+            with open(config_path(), 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            _warn("[yellow]⚠ No config.json found. API-dependent features will be limited.[/yellow]")
+            _warn("[dim]Create a config.json file with your API keys for full functionality.[/dim]\n")
+        except Exception as e:
+            _warn(f"[red]✗ Error loading config: {str(e)}[/red]")
+
+        _config = config
+        return _config
+
+
+def use_config(config):
+    """Replace the process-wide config (benchmarks and embedding callers)"""
+    global _config
+    with _lock:
+        _config = config
+    return config
@@ -0,0 +1,320 @@
+import argparse
+import asyncio
+import codecs
+import hmac
+import ipaddress
+import os
+import secrets
+import socket
+import time
+from typing import Any, Dict, Optional
+
+from utils.cache import default_cache_dir
+from utils.config import load_config
+
+DEFAULT_HOST = '127.0.0.1'
+
+
+def default_socket_path(config: Optional[Dict] = None) -> str:
+    config = config if config is not None else load_config()
+    return config.get('daemon_socket') or os.path.join(config.get('cache_dir') or default_cache_dir(), 'daemon.sock')
+
+
+def default_token_path(config: Optional[Dict] = None) -> str:
+    config = config if config is not None else load_config()
+    return os.path.join(config.get('cache_dir') or default_cache_dir(), 'daemon.token')
+
+
+def read_token(config: Optional[Dict] = None) -> Optional[str]:
+    """Token a client must send to a TCP daemon ("daemon_token" or the daemon's token file)"""
+    config = config if config is not None else load_config()
+    if config.get('daemon_token'):
+        return config['daemon_token']
+    try:
+        with open(default_token_path(config)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def ensure_token(config: Dict) -> str:
+    """The configured token, or a new random one written to an owner-only file"""
+    token = read_token(config)
+    if token:
+        return token
+    path = default_token_path(config)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    return token
+
+
+def is_loopback(host: str) -> bool:
+    try:
+        return all(ipaddress.ip_address(info[4][0]).is_loopback
+                   for info in socket.getaddrinfo(host, None))
+    except (OSError, ValueError):
+        return False
+
+
+class DaemonState:
+    """Everything kept warm between requests: HTTP sessions, caches, AI clients"""
+
+    def __init__(self, config: Dict):
+        from utils.cache import StateStore
+        from utils.email_lookup import EmailOSINT
+        from utils.source_engine import SourceEngine
+
+        self.config = config
+        self.started_at = time.time()
+        self.requests = 0
+        self.osint = EmailOSINT(engine=SourceEngine(config.get('source_concurrency')),
+                                state=StateStore.from_config(config))
+        self._analyzers = {}
+
+    def analyzer(self, provider: str, test_mode: bool, use_cache: bool = True, refresh: bool = False):
+        key = (provider, test_mode, use_cache, refresh)
+        if key not in self._analyzers:
+            from utils.analyzers import create_analyzer
+            self._analyzers[key] = create_analyzer(provider, test_mode=test_mode, use_cache=use_cache, refresh=refresh)
+        return self._analyzers[key]
+
+    async def lookup_email(self, email: str, use_cache: bool = True, refresh: bool = False) -> Dict[str, Any]:
+        from utils.cache import ResponseCache
+        # Cache flags are per request; the session and engine stay shared
+        cache = ResponseCache.from_config(self.config, enabled=use_cache, refresh=refresh)
+        report = await self.osint.collect_async(email, self.config, show_progress=False, cache=cache)
+        return report.to_dict()
+
+
+def create_app(config: Optional[Dict] = None, token: Optional[str] = None):
+    """Build the aiohttp application serving lookups and analysis
+
+    With a token, every request must carry "Authorization: Bearer <token>".
+    """
+    from aiohttp import web
+    from utils.email_lookup import is_valid_email
+
+    state = DaemonState(config if config is not None else load_config())
+    routes = web.RouteTableDef()
+
+    @web.middleware
+    async def authorize(request, handler):
+        # Lookups spend the owner's API keys; a TCP port is open to every local user
+        supplied = request.headers.get('Authorization', '')
+        if token is not None and not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+            return web.json_response({'error': 'missing or invalid daemon token'}, status=401)
+        return await handler(request)
+
+    @routes.get('/health')
+    async def health(request):
+        return web.json_response({
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime': round(time.time() - state.started_at, 1),
+            'requests': state.requests,
+        })
+
+    @routes.post('/email')
+    async def email(request):
+        state.requests += 1
+        payload = await request.json()
+        address = payload.get('email', '')
+        if not is_valid_email(address):
+            return web.json_response({'error': 'Invalid email format provided'}, status=400)
+        report = await state.lookup_email(address, payload.get('use_cache', True), payload.get('refresh', False))
+        return web.json_response({'report': report})
+
+    @routes.post('/name')
+    async def name(request):
+        state.requests += 1
+        from utils import name_lookup
+        from utils.ddg_scheduler import memo_not_before
+        payload = await request.json()
+        if payload.get('refresh') or not payload.get('use_cache', True):
+            memo_not_before.set(time.time())
+        result = await name_lookup.search_by_name_async(payload.get('name', ''), payload.get('email'),
+                                                        payload.get('organization'), state.config)
+        return web.json_response({'result': result.to_dict()})
+
+    def request_analyzer(payload):
+        return state.analyzer(payload.get('provider', 'openai'), bool(payload.get('test_mode', False)),
+                              payload.get('use_cache', True), payload.get('refresh', False))
+
+    @routes.post('/analyze')
+    async def analyze(request):
+        state.requests += 1
+        payload = await request.json()
+        try:
+            analyzer = request_analyzer(payload)
+        except (KeyError, ValueError) as e:
+            return web.json_response({'error': str(e)}, status=400)
+        analysis = await analyzer.analyze_findings(payload.get('findings') or {})
+        return web.json_response({'analysis': analysis})
+
+    @routes.post('/analyze/stream')
+    async def analyze_stream(request):
+        state.requests += 1
+        payload = await request.json()
+        try:
+            analyzer = request_analyzer(payload)
+        except (KeyError, ValueError) as e:
+            return web.json_response({'error': str(e)}, status=400)
+        response = web.StreamResponse(headers={'Content-Type': 'text/plain; charset=utf-8'})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        async for chunk in analyzer.stream_analysis(payload.get('findings') or {}):
+            await response.write(chunk.encode('utf-8'))
+        await response.write_eof()
+        return response
+
+    app = web.Application(middlewares=[authorize])
+    app.add_routes(routes)
+    return app
+
+
+async def _serve(app, socket_path=None, host=None, port=None):
+    from aiohttp import web
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    if port:
+        site = web.TCPSite(runner, host or DEFAULT_HOST, port)
+    else:
+        site = web.UnixSite(runner, socket_path)
+    await site.start()
+    if not port:
+        # Only the current user may talk to the daemon
+        os.chmod(socket_path, 0o600)
+    print(f"[*] data-gather daemon listening on {site.name}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        from utils.http_client import close_sessions
+        close_sessions()
+
+
+def serve(socket_path: Optional[str] = None, host: Optional[str] = None, port: Optional[int] = None,
+          allow_remote: bool = False):
+    """Run the daemon until interrupted
+
+    The Unix socket is protected by its file mode. In TCP mode every client
+    must send the daemon token, and only loopback addresses may be bound
+    unless allow_remote is set.
+    """
+    config = load_config()
+    token = None
+    if port:
+        if not allow_remote and not is_loopback(host or DEFAULT_HOST):
+            raise SystemExit(f"[!] Refusing to listen on {host}: not a loopback address (use --allow-remote "
+                             f"to expose the daemon, and its API keys, to other hosts)")
+        token = ensure_token(config)
+        where = 'daemon_token in config.json' if config.get('daemon_token') else default_token_path(config)
+        print(f"[*] TCP clients must send the token from {where}")
+    app = create_app(config, token)
+
+    if not port:
+        socket_path = socket_path or default_socket_path(config)
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+    try:
+        asyncio.run(_serve(app, socket_path, host, port))
+    except KeyboardInterrupt:
+        print("\n[*] data-gather daemon stopped")
+    finally:
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+class DaemonClient:
+    """Thin client used by the CLI when a daemon is running"""
+
+    def __init__(self, socket_path: Optional[str] = None, url: Optional[str] = None, timeout: float = 600,
+                 token: Optional[str] = None):
+        self.socket_path = socket_path
+        self.url = (url or 'http://localhost').rstrip('/')
+        self.timeout = timeout
+        self.token = token
+
+    def _session(self, timeout):
+        import aiohttp
+        connector = aiohttp.UnixConnector(path=self.socket_path) if self.socket_path else None
+        headers = {'Authorization': f"Bearer {self.token}"} if self.token else None
+        return aiohttp.ClientSession(connector=connector, headers=headers,
+                                     timeout=aiohttp.ClientTimeout(total=timeout))
+
+    async def request(self, path: str, payload: Optional[Dict] = None, timeout: Optional[float] = None) -> Dict:
+        async with self._session(timeout or self.timeout) as session:
+            if payload is None:
+                async with session.get(self.url + path) as response:
+                    return await response.json()
+            async with session.post(self.url + path, json=payload) as response:
+                data = await response.json()
+                if response.status >= 400:
+                    raise ValueError(data.get('error', f"daemon returned {response.status}"))
+                return data
+
+    async def available(self) -> bool:
+        if self.socket_path and not os.path.exists(self.socket_path):
+            return False
+        try:
+            return (await self.request('/health', timeout=1)).get('status') == 'ok'
+        except Exception:
+            return False
+
+    async def lookup_email(self, email: str, use_cache: bool = True, refresh: bool = False) -> Dict:
+        data = await self.request('/email', {'email': email, 'use_cache': use_cache, 'refresh': refresh})
+        return data['report']
+
+    async def search_name(self, name: str, email: Optional[str] = None, organization: Optional[str] = None,
+                          use_cache: bool = True, refresh: bool = False) -> Dict:
+        payload = {'name': name, 'email': email, 'organization': organization,
+                   'use_cache': use_cache, 'refresh': refresh}
+        return (await self.request('/name', payload))['result']
+
+    async def analyze(self, findings: Dict, provider: str, test_mode: bool,
+                      use_cache: bool = True, refresh: bool = False) -> str:
+        data = await self.request('/analyze', {'findings': findings, 'provider': provider, 'test_mode': test_mode,
+                                               'use_cache': use_cache, 'refresh': refresh})
+        return data['analysis']
+
+    async def stream_analysis(self, findings: Dict, provider: str, test_mode: bool,
+                              use_cache: bool = True, refresh: bool = False):
+        """Yield the analysis text as the daemon streams it"""
+        payload = {'findings': findings, 'provider': provider, 'test_mode': test_mode,
+                   'use_cache': use_cache, 'refresh': refresh}
+        async with self._session(self.timeout) as session:
+            async with session.post(self.url + '/analyze/stream', json=payload) as response:
+                if response.status >= 400:
+                    raise ValueError((await response.json()).get('error', f"daemon returned {response.status}"))
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                async for data in response.content.iter_any():
+                    text = decoder.decode(data)
+                    if text:
+                        yield text
+
+
+async def find_daemon() -> Optional[DaemonClient]:
+    """Return a client for the running daemon, or None"""
+    config = load_config()
+    if config.get('daemon_url'):
+        client = DaemonClient(url=config['daemon_url'], token=read_token(config))
+    else:
+        client = DaemonClient(socket_path=default_socket_path(config))
+    return client if await client.available() else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="data-gather serve", description="Run a local data-gather daemon")
+    parser.add_argument("--socket", help="Unix socket path (default: .cache/daemon.sock)")
+    parser.add_argument("--host", help=f"Bind address for TCP mode (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, help="Listen on TCP instead of a Unix socket")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Allow a non-loopback --host (clients still need the daemon token)")
+    args = parser.parse_args(argv)
+    serve(args.socket, args.host, args.port, args.allow_remote)
@@ -0,0 +1,263 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils import deadline as deadlines
+from utils.deadline import DeadlineExceeded
+from utils.tracing import span, traced_sleep
+
+# Paste sites searched for leaked addresses
+PASTE_SITES = ['pastebin.com', 'ghostbin.co', 'rentry.co', 'archive.org']
+
+# DuckDuckGo tolerates roughly one query every couple of seconds
+DEFAULT_RATE = 0.5      # requests per second
+DEFAULT_BURST = 1
+# Requests in flight at once; the token bucket still caps the overall rate
+DEFAULT_CONCURRENCY = 2
+MIN_RATE = 0.05
+# Always fetch at least this many hits so smaller equivalent queries reuse them
+MIN_FETCH = 10
+MEMO_SIZE = 256
+# Answers are only reused for a short while; the response cache covers longer spans
+MEMO_TTL = 600
+
+# Answers fetched before this time are not reused in the current context.
+# Set by runs with --refresh / --no-cache, so they still share queries with
+# each other but never get an answer from an earlier run.
+memo_not_before: ContextVar[float] = ContextVar('ddg_memo_not_before', default=0.0)
+
+
+def paste_site_query(term: str) -> str:
+    """Combined paste-site query for a search term"""
+    sites = ' OR '.join(f'site:{site}' for site in PASTE_SITES)
+    return f'"{term}" ({sites})'
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form used to recognise equivalent queries"""
+    query = query.replace('(', ' ').replace(')', ' ')
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate backs off when the service pushes back"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, sleep=None) -> float:
+        """Block until a request may be sent; returns the time spent waiting"""
+        sleep = sleep or (lambda seconds: traced_sleep(seconds, 'duckduckgo rate limit'))
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = max(self.blocked_until - now, 0.0)
+                if not wait and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                if not wait:
+                    wait = (1 - self.tokens) / self.rate
+            sleep(wait)
+            waited += wait
+
+    def penalize(self, backoff: float):
+        """Rate limited: halve the rate and pause all requests for a while"""
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+
+    def reward(self):
+        """Successful request: creep back toward the configured rate"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * 1.25)
+
+
+class HttpSearch:
+    """
+    DDGS-compatible text search answered by an HTTP endpoint
+
+    Used when "duckduckgo_endpoint" is configured (a search proxy or the
+    offline benchmark server). GET <endpoint>/text?q=...&max_results=N must
+    return a JSON list of {"title", "href", "body"} objects.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = 15):
+        from utils.http_client import get_session
+        self.endpoint = endpoint.rstrip('/')
+        self.timeout = timeout
+        self.session = get_session('search')
+
+    def text(self, query: str, max_results: int = 10) -> List[Dict]:
+        response = self.session.get(f"{self.endpoint}/text", params={'q': query, 'max_results': max_results},
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class _Pending:
+    """A query in flight that equivalent queries wait for"""
+    __slots__ = ('done', 'hits', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.hits: List[Dict] = []
+        self.error: Optional[BaseException] = None
+
+
+class DuckDuckGoScheduler:
+    """Rate-limited, deduplicating front-end to one shared DuckDuckGo session"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 max_retries: int = 3, backoff: float = 5.0, endpoint: Optional[str] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, memo_ttl: float = MEMO_TTL):
+        self.bucket = TokenBucket(rate, burst)
+        self.endpoint = endpoint
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.concurrency = max(1, int(concurrency))
+        self.memo_ttl = memo_ttl
+        self._ddgs = None
+        self._lock = threading.Lock()
+        # A request may wait on the bucket while another one is on the wire
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._memo: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._pending: Dict[str, _Pending] = {}
+
+    def _session(self):
+        with self._lock:
+            if self._ddgs is None:
+                if self.endpoint:
+                    self._ddgs = HttpSearch(self.endpoint)
+                else:
+                    from duckduckgo_search import DDGS
+                    self._ddgs = DDGS()
+            return self._ddgs
+
+    def _reset_session(self):
+        self._ddgs = None
+
+    def _remember(self, key, hits):
+        self._memo[key] = (time.time(), hits)
+        self._memo.move_to_end(key)
+        while len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+
+    def _fetch(self, query: str, max_results: int) -> List[Dict]:
+        with self._slots:
+            delay = self.backoff
+            with span('duckduckgo text', 'http', query=query) as current:
+                for attempt in range(self.max_retries):
+                    self.bucket.acquire()
+                    current.set(retries=attempt)
+                    try:
+                        hits = list(self._session().text(query, max_results=max(max_results, MIN_FETCH)))
+                        self.bucket.reward()
+                        break
+                    except DeadlineExceeded:
+                        # Our own time ran out; DuckDuckGo did nothing wrong
+                        raise
+                    except Exception:
+                        if attempt == self.max_retries - 1:
+                            raise
+                        # Most failures here are rate limits; slow everything down
+                        self.bucket.penalize(delay)
+                        self._reset_session()
+                        delay += 2
+                current.set(status='ok', hits=len(hits))
+            return hits
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict]:
+        """Run one text query, reusing the answer of an equivalent earlier query"""
+        key = normalize_query(query)
+        oldest = max(time.time() - self.memo_ttl, memo_not_before.get())
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is not None and entry[0] >= oldest:
+                self._memo.move_to_end(key)
+                return entry[1][:max_results]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+
+        if not owner:
+            # The same query is already on its way; share its answer
+            while not pending.done.wait(0.1):
+                deadlines.check()
+            if pending.error is not None:
+                raise pending.error
+            return pending.hits[:max_results]
+
+        try:
+            pending.hits = self._fetch(query, max_results)
+            with self._lock:
+                self._remember(key, pending.hits)
+            return pending.hits[:max_results]
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.done.set()
+
+    def stream(self, queries: Iterable[str], max_results: int = 5) -> Iterator[Tuple[str, List[Dict], Optional[Exception]]]:
+        """
+        Yield (query, hits, error) for each query as soon as it completes
+
+        Equivalent queries are only sent once. A deadline stop ends the
+        stream by raising DeadlineExceeded.
+        """
+        seen = set()
+        for query in queries:
+            key = normalize_query(query)
+            if key in seen:
+                continue
+            seen.add(key)
+            try:
+                yield query, self.search(query, max_results), None
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                yield query, [], e
+
+    def close(self):
+        with self._lock:
+            self._ddgs = None
+            self._memo.clear()
+
+
+_scheduler: Optional[DuckDuckGoScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(config: Optional[Dict] = None) -> DuckDuckGoScheduler:
+    """Process-wide scheduler shared by every DuckDuckGo caller"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            config = config or {}
+            _scheduler = DuckDuckGoScheduler(
+                rate=config.get('duckduckgo_rate', DEFAULT_RATE),
+                burst=config.get('duckduckgo_burst', DEFAULT_BURST),
+                endpoint=config.get('duckduckgo_endpoint'),
+                concurrency=config.get('duckduckgo_concurrency', DEFAULT_CONCURRENCY),
+                memo_ttl=config.get('duckduckgo_memo_ttl', MEMO_TTL),
+            )
+        return _scheduler
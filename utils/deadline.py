@@ -0,0 +1,253 @@
+import asyncio
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Executor, Future, wait as wait_for_futures
+from contextvars import ContextVar, copy_context
+from typing import Callable, List, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised inside a source check once its budget or the run deadline is used up"""
+
+
+class Deadline:
+    """
+    A point in time after which work should stop, or an explicit cancellation
+
+    Deadlines nest: a source's budget is a child of the run deadline, so
+    cancelling the run (deadline reached, Ctrl-C) stops every source. Source
+    checks run in worker threads and cannot be killed, so they look at the
+    deadline of their context at cooperative points: sleeps, retries and
+    HTTP requests, whose timeouts are clamped to the time left.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, parent: Optional['Deadline'] = None):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self.parent = parent
+        self.reason: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        if parent is not None:
+            parent.on_cancel(self._parent_cancelled)
+
+    def start(self, seconds: Optional[float]):
+        """(Re)start the clock: expire seconds from now (None removes the limit)"""
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, 0 once expired or cancelled, None without a limit"""
+        if self.cancelled:
+            return 0.0
+        limits = [self.expires_at - time.monotonic()] if self.expires_at is not None else []
+        if self.parent is not None and self.parent.remaining() is not None:
+            limits.append(self.parent.remaining())
+        return max(0.0, min(limits)) if limits else None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceeded(self.reason or "deadline reached")
+
+    def cancel(self, reason: str = 'cancelled'):
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self.reason = reason
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _parent_cancelled(self):
+        self.cancel(self.parent.reason)
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Call callback (once) when the deadline is cancelled"""
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def detach(self):
+        """Stop following the parent (call when the work this deadline guards is done)"""
+        if self.parent is not None:
+            with self.parent._lock:
+                if self._parent_cancelled in self.parent._callbacks:
+                    self.parent._callbacks.remove(self._parent_cancelled)
+
+    @property
+    def listening(self) -> bool:
+        return bool(self._callbacks)
+
+    async def wait(self):
+        """Wait on the event loop until the deadline passes or is cancelled"""
+        loop = asyncio.get_running_loop()
+        cancelled = loop.create_future()
+        self.on_cancel(lambda: loop.call_soon_threadsafe(
+            lambda: cancelled.done() or cancelled.set_result(None)))
+        try:
+            await asyncio.wait_for(cancelled, self.remaining())
+        except asyncio.TimeoutError:
+            pass
+
+
+class WorkerPool(Executor):
+    """
+    Thread pool for work that may be abandoned when a deadline passes
+
+    ThreadPoolExecutor threads are joined when the interpreter exits, so a
+    request given up on at the deadline would still hold the process open
+    until its own timeout. These threads are daemons: the process exits as
+    soon as the run is done. Each task runs in a copy of the submitter's
+    context, so the current deadline applies inside it. Idle threads exit
+    after idle_timeout seconds.
+    """
+
+    def __init__(self, max_workers: int, name: str = 'worker', idle_timeout: float = 60.0):
+        self.max_workers = max(1, int(max_workers))
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._shutdown = False
+        self._futures = set()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        context = copy_context()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot submit after shutdown')
+            self._futures.add(future)
+            future.add_done_callback(self._futures.discard)
+            self._queue.put((future, context, fn, args, kwargs))
+            if not self._idle.acquire(blocking=False) and self._threads < self.max_workers:
+                self._threads += 1
+                threading.Thread(target=self._work, name=f"{self.name}-{self._threads}", daemon=True).start()
+        return future
+
+    def _work(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # Leave only if no submit has counted on this thread meanwhile
+                    if self._idle.acquire(blocking=False):
+                        self._threads -= 1
+                        return
+                continue
+            if item is None:
+                return
+            future, context, fn, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(context.run(fn, *args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            self._idle.release()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            self._shutdown = True
+            threads = self._threads
+            futures = list(self._futures)
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in range(threads):
+            self._queue.put(None)
+        if wait:
+            # Waits for the submitted work, but the threads themselves are never joined
+            wait_for_futures(futures)
+
+
+# Deadline of the source check running in the current thread
+current: ContextVar[Optional[Deadline]] = ContextVar('deadline', default=None)
+
+
+def remaining() -> Optional[float]:
+    deadline = current.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def check():
+    """Raise DeadlineExceeded if the current source is out of time"""
+    deadline = current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def sleep(seconds: float):
+    """time.sleep that wakes up early, raising DeadlineExceeded, when time runs out"""
+    deadline = current.get()
+    if deadline is None:
+        time.sleep(seconds)
+        return
+    left = deadline.remaining()
+    if left is not None and left < seconds:
+        deadline._cancelled.wait(left)
+        raise DeadlineExceeded(deadline.reason or "deadline reached")
+    if deadline._cancelled.wait(seconds):
+        raise DeadlineExceeded(deadline.reason or "cancelled")
+
+
+def clamp_timeout(timeout):
+    """Shorten a requests timeout (number or (connect, read) tuple) to the time left"""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        check()
+        raise DeadlineExceeded("deadline reached")
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(min(t, left) if t is not None else left for t in timeout)
+    return min(timeout, left)
+
+
+def handle_interrupts(deadline: Deadline, on_interrupt: Optional[Callable[[], None]] = None,
+                      fallback: Optional[Callable[[], None]] = None) -> bool:
+    """
+    Make the first Ctrl-C cancel deadline instead of killing the run
+
+    Sources still running are stopped and the run carries on with what was
+    already collected; a second Ctrl-C interrupts as usual. When nothing is
+    waiting on the deadline, fallback is called instead (e.g. to cancel the
+    main task). Returns False where signal handlers are unavailable.
+    """
+    loop = asyncio.get_running_loop()
+
+    def interrupted():
+        loop.remove_signal_handler(signal.SIGINT)
+        if not deadline.listening and fallback is not None:
+            fallback()
+            return
+        if on_interrupt is not None:
+            on_interrupt()
+        deadline.cancel('interrupted')
+
+    try:
+        loop.add_signal_handler(signal.SIGINT, interrupted)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Windows event loops and non-main threads
+        return False
+    return True
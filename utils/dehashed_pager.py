@@ -0,0 +1,73 @@
+# DeHashed refuses to page past this many entries for one query
+MAX_WINDOW = 10000
+
+
+class DeHashedError(Exception):
+    """Raised when the search endpoint answers with an error"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def entry_key(entry):
+    """Entries are the same leak when database, username and hash match"""
+    return (entry.get('database_name'), entry.get('username'),
+            entry.get('hashed_password') or entry.get('password'))
+
+
+def iter_entries(session, base_url, query, auth, page_size=100, limit=None, totals=None):
+    """
+    Yield unique DeHashed search entries page by page
+
+    Only one page is held at a time; entries already seen (same database,
+    username and hash) are dropped. Paging stops at the last page, at limit
+    unique entries or at DeHashed's paging window. A page that comes back
+    full is followed by the next one; the reported total, when present,
+    only caps the paging.
+
+    Args:
+        session: requests session used for the calls
+        base_url (str): DeHashed API base URL
+        query (str): DeHashed query, e.g. "email:user@example.com"
+        auth (tuple): (account email, API key)
+        page_size (int): Entries requested per page
+        limit (int): Stop after this many unique entries
+        totals (dict): Filled with 'reported' (DeHashed's total) and 'pages'
+    """
+    totals = totals if totals is not None else {}
+    totals.setdefault('pages', 0)
+    seen = set()
+    page = 1
+
+    while (page - 1) * page_size < MAX_WINDOW:
+        response = session.get(
+            f"{base_url}/search",
+            params={'query': query, 'size': page_size, 'page': page},
+            auth=auth,
+            timeout=15
+        )
+        if response.status_code != 200:
+            raise DeHashedError(f"DeHashed check failed (Status: {response.status_code})", response.status_code)
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise DeHashedError("Failed to parse DeHashed results")
+
+        totals['pages'] += 1
+        reported = data.get('total') or 0
+        totals['reported'] = reported
+        entries = data.get('entries') or []
+        for entry in entries:
+            key = entry_key(entry)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield entry
+            if limit and len(seen) >= limit:
+                return
+
+        if len(entries) < page_size or (reported and page * page_size >= reported):
+            return
+        page += 1
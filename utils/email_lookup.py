@@ -1,178 +1,286 @@
-import requests
-import json
+import asyncio
+import copy
 import time
 import re
 import base64
 import hashlib
 from urllib.parse import urlencode, quote
-from duckduckgo_search import DDGS
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import os
+from collections import Counter
+from utils.source_engine import SourceEngine, SourceJob
+from utils.cache import DAY, ResponseCache, StateStore
+from utils.circuit_breaker import CircuitBreakers
+from utils.config import load_config
+from utils.ddg_scheduler import get_scheduler, memo_not_before, paste_site_query
+from utils import deadline as deadlines
+from utils.deadline import DeadlineExceeded, WorkerPool
+from utils.dehashed_pager import DeHashedError, iter_entries
+from utils.hibp_catalog import BreachCatalog
+from utils.history import FindingsHistory, diff_results
+from utils.intelx_endpoints import EndpointDirectory
+from utils.intelx_poller import IntelXPollError, poll_results
+from utils.http_client import get_session
+from utils.tracing import span, traced_sleep
+from utils.models import (
+    FOUND, CLEAN, SKIPPED, ERROR,
+    Breach, CredentialLeak, LeakRecord, PasteHit, ProfileField,
+    SourceResult, EmailReport,
+)
+from utils import report_renderer
 
 console = Console()
 
+# API base URLs; override with "api_base_urls" in config.json (e.g. for a
+# self-hosted proxy or the offline benchmark server)
+DEFAULT_BASE_URLS = {
+    'gravatar': 'https://www.gravatar.com',
+    'hibp': 'https://haveibeenpwned.com/api/v3',
+    'dehashed': 'https://api.dehashed.com',
+    'leakcheck': 'https://leakcheck.io/api/public',
+}
+
+# Cached Gravatar profiles are revalidated with If-None-Match for this long
+GRAVATAR_ETAG_TTL = 30 * DAY
+
+# DeHashed entries per page, and how many are kept in the report (all are counted)
+DEHASHED_PAGE_SIZE = 100
+DEHASHED_KEEP = 100
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+def is_valid_email(email):
+    """Validate email format"""
+    return bool(EMAIL_PATTERN.match(email or ''))
+
+
+def _truncate(value, length=20):
+    """Shorten long secrets the same way the report tables always did"""
+    if value and len(value) > length:
+        return value[:length] + "..."
+    return value or None
+
+
 class EmailOSINT:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, engine=None, cache=None, state=None, ddg=None, config=None):
+        self.config = config
+        self.engine = engine
+        self.cache = cache
+        self.state = state
+        self.ddg = ddg
+        self._intelx_endpoints = None
+        self._breach_catalog = None
+        self.breakers = None
+        self.history = None
+        # Shared by every EmailOSINT in the process, so keep-alive connections are reused
+        self.session = get_session('osint', config, headers={'User-Agent': USER_AGENT})
+
+    def settings(self):
+        """Config used by the checks: the one given to collect_async, else config.json"""
+        if self.config is None:
+            self.config = load_config()
+        return self.config
+
+    def base_url(self, source):
+        base_urls = self.settings().get('api_base_urls') or {}
+        return (base_urls.get(source) or DEFAULT_BASE_URLS[source]).rstrip('/')
+
+    def state_store(self):
+        """Persistent state shared across runs (ETags, IntelX endpoints, ...)"""
+        if self.state is None:
+            self.state = StateStore.from_config(self.settings())
+        return self.state
+
+    def breach_catalog(self):
+        """Local HIBP breach catalog, shared by every lookup of this instance"""
+        if self._breach_catalog is None:
+            self._breach_catalog = BreachCatalog.from_config(self.session, self.base_url('hibp'), self.settings())
+        return self._breach_catalog
+
+    @staticmethod
+    def _gravatar_profile(profile_data):
+        """Profile fields from a Gravatar {hash}.json answer, as [name, value] pairs"""
+        fields = []
+        if 'entry' in profile_data and profile_data['entry']:
+            entry = profile_data['entry'][0]
+            fields.append(['Name', entry.get('displayName', 'N/A')])
+            fields.append(['About', entry.get('aboutMe', 'N/A')])
+            for url in entry.get('urls', []):
+                fields.append(['URL', url.get('value', 'N/A')])
+        return fields
 
     def gravatar_lookup(self, email):
         """Check if email has an associated Gravatar profile"""
-        console.print("[bold blue]🔍 Checking Gravatar...[/bold blue]")
+        result = SourceResult('gravatar')
 
         try:
             email_hash = hashlib.md5(email.lower().encode()).hexdigest()
-            gravatar_url = f"https://www.gravatar.com/avatar/{email_hash}?d=404"
-
-            response = self.session.get(gravatar_url, timeout=10)
-            if response.status_code == 200:
-                profile_url = f"https://www.gravatar.com/{email_hash}"
-                console.print(f"[green]✓ Gravatar found:[/green] {profile_url}")
-
+            profile_url = f"{self.base_url('gravatar')}/{email_hash}"
+            avatar_url = f"{self.base_url('gravatar')}/avatar/{email_hash}?d=404"
+
+            # A profile we saw before is revalidated with its ETag (304, no body)
+            state_key = f"gravatar:{email_hash}"
+            known = self.state_store().get(state_key) or {}
+            headers = {'If-None-Match': known['etag']} if known.get('etag') else {}
+
+            # HEAD answers "does an avatar exist" without the image bytes, and
+            # runs alongside the profile fetch so the check costs one round trip.
+            # The pool runs it in this check's context, so its timeout follows
+            # the deadline.
+            with WorkerPool(1, name='gravatar-probe') as pool:
+                probe = pool.submit(self.session.head, avatar_url, timeout=10)
                 try:
-                    profile_response = self.session.get(f"{profile_url}.json", timeout=10)
-                    if profile_response.status_code == 200:
-                        profile_data = profile_response.json()
-                        if 'entry' in profile_data and profile_data['entry']:
-                            entry = profile_data['entry'][0]
-                            console.print(f"[cyan]   Name:[/cyan] {entry.get('displayName', 'N/A')}")
-                            console.print(f"[cyan]   About:[/cyan] {entry.get('aboutMe', 'N/A')}")
-                            if 'urls' in entry:
-                                for url in entry['urls']:
-                                    console.print(f"[cyan]   URL:[/cyan] {url.get('value', 'N/A')}")
-                except:
-                    pass
-            else:
-                console.print("[yellow]⚠ No Gravatar found[/yellow]")
+                    profile_response, profile_error = self.session.get(
+                        f"{profile_url}.json", headers=headers, timeout=10), None
+                except Exception as e:
+                    profile_response, profile_error = None, e
+                try:
+                    avatar_response, avatar_error = probe.result(), None
+                except Exception as e:
+                    avatar_response, avatar_error = None, e
+            if profile_error is not None and avatar_error is not None:
+                raise profile_error
+
+            fields = None
+            if profile_response is not None and profile_response.status_code == 304:
+                fields = known.get('profile')
+            elif profile_response is not None and profile_response.status_code == 200:
+                try:
+                    fields = self._gravatar_profile(profile_response.json())
+                except ValueError:
+                    fields = None
+                etag = profile_response.headers.get('ETag')
+                if etag and fields is not None:
+                    self.state_store().set(state_key, {'etag': etag, 'profile': fields}, ttl=GRAVATAR_ETAG_TTL)
+
+            # Either request answering is enough to decide
+            if (avatar_response is not None and avatar_response.status_code == 200) or fields:
+                result.status = FOUND
+                result.url = profile_url
+                for name, value in fields or []:
+                    result.profile.append(ProfileField(name, value))
+            if profile_error is not None:
+                result.notes.append(f"Profile fetch failed ({profile_error}); result based on the avatar check")
+            elif avatar_error is not None:
+                result.notes.append(f"Avatar check failed ({avatar_error}); result based on the profile")
 
         except Exception as e:
-            console.print(f"[red]✗ Gravatar lookup failed: {str(e)}[/red]")
+            result.error(f"Gravatar lookup failed: {str(e)}")
+
+        return result
 
     def check_haveibeenpwned(self, email):
         """Check Have I Been Pwned for breaches"""
-        console.print("[bold blue]🔍 Checking Have I Been Pwned...[/bold blue]")
+        result = SourceResult('hibp')
 
         try:
-            breach_url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{quote(email)}?truncateResponse=false"
+            # Only breach names per account; the details come from the local catalog
+            breach_url = f"{self.base_url('hibp')}/breachedaccount/{quote(email)}?truncateResponse=true"
             response = self.session.get(breach_url, timeout=10)
 
             if response.status_code == 200:
-                breaches = response.json()
-                console.print(f"[red]⚠ Found in {len(breaches)} breach(es):[/red]")
-
-                table = Table(show_header=True, header_style="bold magenta")
-                table.add_column("Breach Name", style="red")
-                table.add_column("Date", style="yellow")
-                table.add_column("Compromised Data", style="cyan")
-
-                for breach in breaches:
-                    compromised_data = ", ".join(breach.get('DataClasses', []))
-                    table.add_row(
-                        breach['Name'],
-                        breach['BreachDate'],
-                        compromised_data
-                    )
-                console.print(table)
-
-            elif response.status_code == 404:
-                console.print("[green]✓ No breaches found in HIBP[/green]")
-            else:
-                console.print(f"[yellow]⚠ HIBP check failed (Status: {response.status_code})[/yellow]")
+                names = [breach['Name'] for breach in response.json()]
+                details = self.breach_catalog().resolve(names)
+                for name in names:
+                    breach = details.get(name, {})
+                    result.breaches.append(Breach(
+                        name=name,
+                        source='hibp',
+                        date=breach.get('BreachDate'),
+                        data_classes=breach.get('DataClasses', []),
+                    ))
+                result.status = FOUND
+                result.total = len(result.breaches)
+
+            elif response.status_code != 404:
+                result.error(f"HIBP check failed (Status: {response.status_code})", response.status_code)
 
         except Exception as e:
-            console.print(f"[red]✗ HIBP lookup failed: {str(e)}[/red]")
+            result.error(f"HIBP lookup failed: {str(e)}")
+
+        return result
 
     def check_dehashed(self, email, api_key=None):
         """Check DeHashed for leaked credentials"""
+        result = SourceResult('dehashed')
         if not api_key:
-            console.print("[yellow]⚠ DeHashed API key not provided, skipping...[/yellow]")
-            return
-
-        console.print("[bold blue]🔍 Checking DeHashed...[/bold blue]")
-
+            result.status = SKIPPED
+            result.notes.append("DeHashed API key not provided, skipping...")
+            return result
+
+        settings = self.settings()
+        keep = int(settings.get('dehashed_max_entries', DEHASHED_KEEP))
+        totals = {}
+        databases = Counter()
         try:
-            url = "https://api.dehashed.com/search"
-            params = {'query': f'email:{email}', 'size': 100}
-
-            response = self.session.get(url, params=params,
-                                        auth=(api_key.split(':')[0], api_key.split(':')[1]),
-                                        timeout=15)
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('entries'):
-                    console.print(f"[red]⚠ Found {len(data['entries'])} entries in DeHashed[/red]")
-
-                    table = Table(show_header=True, header_style="bold magenta")
-                    table.add_column("Database", style="red")
-                    table.add_column("Username", style="yellow")
-                    table.add_column("Password", style="cyan")
-                    table.add_column("Hash", style="green")
-
-                    for entry in data['entries'][:10]:
-                        table.add_row(
-                            entry.get('database_name', 'N/A'),
-                            entry.get('username', 'N/A'),
-                            entry.get('password', 'N/A')[:20] + "..." if entry.get('password') and len(entry.get('password', '')) > 20 else entry.get('password', 'N/A'),
-                            entry.get('hashed_password', 'N/A')[:20] + "..." if entry.get('hashed_password') and len(entry.get('hashed_password', '')) > 20 else entry.get('hashed_password', 'N/A')
-                        )
-                    console.print(table)
-                else:
-                    console.print("[green]✓ No entries found in DeHashed[/green]")
-            else:
-                console.print(f"[yellow]⚠ DeHashed check failed (Status: {response.status_code})[/yellow]")
-
+            entries = iter_entries(self.session, self.base_url('dehashed'), f'email:{email}',
+                                   (api_key.split(':')[0], api_key.split(':')[1]),
+                                   page_size=int(settings.get('dehashed_page_size', DEHASHED_PAGE_SIZE)),
+                                   limit=settings.get('dehashed_limit'), totals=totals)
+            for entry in entries:
+                result.total += 1
+                databases[entry.get('database_name', 'N/A')] += 1
+                # Every entry is counted, but only the first few are kept
+                if len(result.credentials) < keep:
+                    result.credentials.append(CredentialLeak(
+                        database=entry.get('database_name', 'N/A'),
+                        source='dehashed',
+                        username=entry.get('username'),
+                        password=_truncate(entry.get('password')),
+                        hashed_password=_truncate(entry.get('hashed_password')),
+                    ))
+        except DeHashedError as e:
+            result.error(str(e), e.status_code)
         except Exception as e:
-            console.print(f"[red]✗ DeHashed lookup failed: {str(e)}[/red]")
+            result.error(f"DeHashed lookup failed: {str(e)}")
+
+        if result.total:
+            # Entries from pages read before a failure are still results
+            result.status = FOUND
+            result.databases = dict(databases.most_common())
+            if totals.get('reported', 0) > result.total:
+                result.notes.append(f"{result.total} unique of {totals['reported']} entries reported by DeHashed "
+                                    f"({totals['pages']} page(s) read)")
+
+        return result
+
+    def ddg_scheduler(self):
+        """Shared DuckDuckGo scheduler (rate limiting, session reuse, query dedup)"""
+        if self.ddg is None:
+            self.ddg = get_scheduler(self.settings())
+        return self.ddg
+
+    def intelx_endpoints(self):
+        """Endpoint directory that remembers the working IntelX base URL"""
+        if self._intelx_endpoints is None:
+            self._intelx_endpoints = EndpointDirectory(self.session, self.state_store(),
+                                                       endpoints=self.settings().get('intelx_endpoints'))
+        return self._intelx_endpoints
 
     def check_intelx_email(self, email, api_key=None):
         """Search IntelligenceX for email occurrences using direct API"""
+        result = SourceResult('intelx')
+        manual_search = f"Try manually searching at https://intelx.io/?s={quote(email)}"
 
         if not api_key:
-            console.print("[yellow]⚠ IntelX API key not provided, skipping...[/yellow]")
-            return
-
-        console.print("[bold blue]🔍 Checking IntelligenceX...[/bold blue]")
+            result.status = SKIPPED
+            result.notes.append("IntelX API key not provided, skipping...")
+            return result
 
         try:
-            # Try multiple API endpoints to improve connectivity
-            api_endpoints = [
-                "https://leakcheck.io/api/public",
-                "https://leakcheck.io/api/v2",
-                "https://free.intelx.io/",
-                "https://2.intelx.io",
-                "https://public.intelx.io",
-                "https://www.intelx.io/apiv2"
-            ]
-
-            connected = False
-            base_url = None
-
-            for endpoint in api_endpoints:
-                try:
-                    # Test connection to endpoint
-                    test_response = self.session.get(
-                        f"{endpoint}/authenticate/info",
-                        headers={'x-key': api_key},
-                        timeout=10
-                    )
-                    if test_response.status_code == 200:
-                        base_url = endpoint
-                        connected = True
-                        break
-                except:
-                    continue
+            # Reuse the last known-good endpoint; probe all candidates only when needed
+            endpoints = self.intelx_endpoints()
+            base_url = endpoints.resolve(api_key)
 
-            if not connected:
-                console.print("[red]✗ Unable to connect to any IntelX API endpoints[/red]")
-                console.print("[yellow]⚠ This could be due to network issues, an invalid API key, or API changes[/yellow]")
-                console.print("[cyan]ℹ You can manually search for this email at https://intelx.io[/cyan]")
-                return
+            if not base_url:
+                result.error("Unable to connect to any IntelX API endpoints")
+                result.notes.append("This could be due to network issues, an invalid API key, or API changes")
+                result.notes.append("You can manually search for this email at https://intelx.io")
+                return result
 
             headers = {
                 'x-key': api_key,
@@ -180,7 +288,7 @@ class EmailOSINT:
             }
 
             # Create search
-            search_data = {
+            search_request = {
                 "term": email,
                 "maxresults": 50,
                 "media": 0,
@@ -194,121 +302,95 @@ class EmailOSINT:
 
             # Initiate search with timeout and retry
             max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    search_response = self.session.post(
-                        f"{base_url}/intelligent/search",
-                        headers=headers,
-                        json=search_data,
-                        timeout=15
-                    )
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        console.print(f"[yellow]⚠ Retrying IntelX connection (attempt {attempt+1}/{max_retries})...[/yellow]")
-                        time.sleep(2)
-                    else:
-                        console.print("[red]✗ IntelX API connection failed after multiple attempts[/red]")
-                        console.print(f"[cyan]ℹ Try manually searching at https://intelx.io/?s={quote(email)}[/cyan]")
-                        return
+            with span('intelx search request', 'retry') as attempts:
+                for attempt in range(max_retries):
+                    attempts.set(retries=attempt)
+                    try:
+                        search_response = self.session.post(
+                            f"{base_url}/intelligent/search",
+                            headers=headers,
+                            json=search_request,
+                            timeout=15
+                        )
+                        break
+                    except Exception as e:
+                        if attempt < max_retries - 1:
+                            traced_sleep(2, 'intelx retry')
+                        else:
+                            attempts.set(status='error')
+                            endpoints.invalidate()
+                            result.error("IntelX API connection failed after multiple attempts")
+                            result.notes.append(manual_search)
+                            return result
 
             if search_response.status_code != 200:
-                console.print(f"[red]✗ IntelX search request failed: {search_response.status_code}[/red]")
+                result.error(f"IntelX search request failed: {search_response.status_code}",
+                             search_response.status_code)
                 if search_response.status_code == 401:
-                    console.print("[yellow]⚠ Your API key might be invalid or expired[/yellow]")
-                console.print(f"[cyan]ℹ Try manually searching at https://intelx.io/?s={quote(email)}[/cyan]")
-                return
+                    result.notes.append("Your API key might be invalid or expired")
+                result.notes.append(manual_search)
+                return result
 
             try:
                 search_data = search_response.json()
                 search_id = search_data.get('id')
             except:
-                console.print("[red]✗ Failed to parse IntelX response[/red]")
-                return
+                return result.error("Failed to parse IntelX response")
 
             if not search_id:
-                console.print("[red]✗ IntelX search ID not received[/red]")
-                return
-
-            # Wait for results to be ready
-            console.print("[dim]Waiting for IntelX search results...[/dim]")
-            time.sleep(5)  # Initial wait
-
-            # Check search status
-            status_url = f"{base_url}/intelligent/search/result"
-            params = {
-                'id': search_id,
-                'limit': 20,  # Limit to 20 results
-                'statistics': 1,
-                'offset': 0
-            }
+                return result.error("IntelX search ID not received")
 
+            # Poll adaptively: records are collected as soon as IntelX has them
             try:
-                status_response = self.session.get(
-                    status_url,
-                    headers=headers,
-                    params=params,
-                    timeout=15
-                )
+                for record in poll_results(self.session, base_url, headers, search_id,
+                                           max_results=search_request['maxresults'],
+                                           timeout=search_request['timeout']):
+                    result.records.append(self._intelx_record(record))
+            except IntelXPollError as e:
+                result.error(str(e), e.status_code)
             except Exception as e:
-                console.print(f"[red]✗ Failed to retrieve IntelX results: {str(e)}[/red]")
-                console.print(f"[cyan]ℹ Your search was initiated. Try viewing results at https://intelx.io[/cyan]")
-                return
+                result.error(f"Failed to retrieve IntelX results: {str(e)}")
+                result.notes.append("Your search was initiated. Try viewing results at https://intelx.io")
 
-            if status_response.status_code != 200:
-                console.print(f"[red]✗ IntelX result request failed: {status_response.status_code}[/red]")
-                return
+            if result.records:
+                # Partial results from an interrupted poll are still results
+                result.status = FOUND
+                result.total = len(result.records)
 
+        except Exception as e:
+            result.error(f"IntelX lookup failed: {str(e)}")
+            result.notes.append(manual_search)
+
+        return result
+
+    def _intelx_record(self, record):
+        """Convert a raw IntelX search record into a LeakRecord"""
+        date_str = None
+        if record.get("date"):
             try:
-                result_data = status_response.json()
-                records = result_data.get('records', [])
-                total_records = result_data.get('totalhits', 0)
+                date_timestamp = record.get("date") / 1000.0
+                date_str = time.strftime("%Y-%m-%d", time.gmtime(date_timestamp))
             except:
-                console.print("[red]✗ Failed to parse IntelX results[/red]")
-                return
-
-            if total_records > 0 and records:
-                console.print(f"[red]⚠ Found {total_records} record(s) in IntelX:[/red]")
-                table = Table(show_header=True, header_style="bold magenta")
-                table.add_column("Type", style="red")
-                table.add_column("Date", style="cyan")
-                table.add_column("Source", style="yellow")
-                table.add_column("Media", style="green")
-
-                for record in records[:10]:
-                    # Format date
-                    date_str = "N/A"
-                    if record.get("date"):
-                        try:
-                            date_timestamp = record.get("date") / 1000.0
-                            date_str = time.strftime("%Y-%m-%d", time.gmtime(date_timestamp))
-                        except:
-                            date_str = str(record.get("date"))
-
-                    table.add_row(
-                        record.get("name", "N/A"),
-                        date_str,
-                        record.get("bucket", "N/A"),
-                        record.get("media", "N/A")
-                    )
-                console.print(table)
-            else:
-                console.print("[green]✓ No matches found in IntelX[/green]")
+                date_str = str(record.get("date"))
 
-        except Exception as e:
-            console.print(f"[red]✗ IntelX lookup failed: {str(e)}[/red]")
-            console.print(f"[cyan]ℹ Try manually searching at https://intelx.io/?s={quote(email)}[/cyan]")
+        return LeakRecord(
+            name=record.get("name", "N/A"),
+            source='intelx',
+            date=date_str,
+            bucket=record.get("bucket"),
+            media=str(record["media"]) if record.get("media") is not None else None,
+        )
 
     def check_leakcheck(self, email, api_key=None):
         """Check LeakCheck for breaches"""
+        result = SourceResult('leakcheck')
         if not api_key:
-            console.print("[yellow]⚠ LeakCheck API key not provided, skipping...[/yellow]")
-            return
-
-        console.print("[bold blue]🔍 Checking LeakCheck...[/bold blue]")
+            result.status = SKIPPED
+            result.notes.append("LeakCheck API key not provided, skipping...")
+            return result
 
         try:
-            url = f"https://leakcheck.io/api/public?check={quote(email)}"
+            url = f"{self.base_url('leakcheck')}?check={quote(email)}"
             headers = {"X-API-Key": api_key}
 
             response = self.session.get(url, headers=headers, timeout=15)
@@ -316,165 +398,103 @@ class EmailOSINT:
             if response.status_code == 200:
                 data = response.json()
                 if data.get('found') and data.get('sources'):
-                    console.print(f"[red]⚠ Found in {len(data['sources'])} source(s):[/red]")
-
                     for source in data['sources']:
-                        console.print(f"[cyan]   • {source}[/cyan]")
-                else:
-                    console.print("[green]✓ No leaks found in LeakCheck[/green]")
+                        if isinstance(source, dict):
+                            result.breaches.append(Breach(source.get('name', 'N/A'), 'leakcheck', source.get('date')))
+                        else:
+                            result.breaches.append(Breach(str(source), 'leakcheck'))
+                    result.status = FOUND
+                    result.total = len(result.breaches)
             else:
-                console.print(f"[yellow]⚠ LeakCheck failed (Status: {response.status_code})[/yellow]")
+                result.error(f"LeakCheck failed (Status: {response.status_code})", response.status_code)
 
         except Exception as e:
-            console.print(f"[red]✗ LeakCheck lookup failed: {str(e)}[/red]")
+            result.error(f"LeakCheck lookup failed: {str(e)}")
+
+        return result
 
     def check_breach_directory(self, email):
         """Check various breach directories and paste sites with improved rate limiting"""
-        console.print("[bold blue]🔍 Checking Breach Directories...[/bold blue]")
-
-        found_count = 0
+        result = SourceResult('breach_directory')
 
         # Single, more targeted search to avoid rate limits
+        query = paste_site_query(email)
         try:
-            console.print("[dim]Searching paste sites...[/dim]")
-            time.sleep(3)  # Initial delay
-
-            with DDGS() as ddgs:
-                # Combined query to reduce number of requests
-                query = f'"{email}" (site:pastebin.com OR site:ghostbin.co OR site:rentry.co OR site:archive.org)'
-
-                try:
-                    results = list(ddgs.text(query, max_results=5))
-
-                    if results:
-                        console.print(f"[yellow]⚠ Found {len(results)} potential paste site matches[/yellow]")
-                        for result in results:
-                            console.print(f"[cyan]   • {result['title']} - {result['href']}[/cyan]")
-                        found_count += len(results)
-                    else:
-                        console.print("[green]✓ No matches found in paste sites[/green]")
-
-                except Exception as e:
-                    console.print(f"[yellow]⚠ Paste site search failed (rate limited): {str(e)}[/yellow]")
-                    # Fallback: provide manual search URLs
-                    console.print("[dim]Manual search URLs:[/dim]")
-                    console.print(f"[cyan]   Pastebin: https://pastebin.com/search?q={quote(email)}[/cyan]")
-                    console.print(f"[cyan]   Archive.org: https://archive.org/search.php?query={quote(email)}[/cyan]")
-
+            for hit in self.ddg_scheduler().search(query, max_results=5):
+                result.pastes.append(self._search_hit(hit, 'breach_directory', query))
+            if result.pastes:
+                result.status = FOUND
+                result.total = len(result.pastes)
+
+        except DeadlineExceeded:
+            raise
         except Exception as e:
-            console.print(f"[red]✗ Breach directory search failed: {str(e)}[/red]")
+            result.error(f"Paste site search failed (rate limited): {str(e)}")
+            # Fallback: provide manual search URLs
+            result.links.append(ProfileField('Pastebin', f"https://pastebin.com/search?q={quote(email)}"))
+            result.links.append(ProfileField('Archive.org', f"https://archive.org/search.php?query={quote(email)}"))
 
-        if found_count == 0:
-            console.print("[green]✓ No obvious matches in breach directories[/green]")
+        return result
 
     def duckduckgo_email_search(self, email):
         """Enhanced DuckDuckGo search with multiple queries and rate limiting protection"""
-        console.print("[bold blue]🔍 Performing DuckDuckGo searches...[/bold blue]")
+        result = SourceResult('duckduckgo')
 
-        # Prioritized queries - most important first
+        # Prioritized queries - most important first. The paste-site query is
+        # shared with check_breach_directory, so the scheduler only sends it once.
         queries = [
             f'"{email}"',
             f'"{email}" breach OR leak OR dump',
-            f'"{email}" site:pastebin.com OR site:ghostbin.co',
+            paste_site_query(email),
             f'"{email}" database OR hack OR compromise'
         ]
 
-        all_results = []
         failed_queries = []
 
-        for i, query in enumerate(queries):
-            try:
-                console.print(f"[dim]Searching ({i+1}/{len(queries)}): {query}[/dim]")
-
-                # Increased delay and retry logic
-                max_retries = 3
-                retry_delay = 5
-
-                for attempt in range(max_retries):
-                    try:
-                        # Create new DDGS instance for each query to avoid session issues
-                        with DDGS() as ddgs:
-                            results = list(ddgs.text(query, max_results=2))
-
-                        if results:
-                            for result in results:
-                                result['query'] = query
-                                all_results.append(result)
-                            console.print(f"[green]   ✓ Found {len(results)} results[/green]")
-                            break
-                        else:
-                            console.print(f"[yellow]   ⚠ No results for this query[/yellow]")
-                            break
-
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            console.print(f"[yellow]   ⚠ Attempt {attempt + 1} failed, retrying in {retry_delay}s...[/yellow]")
-                            time.sleep(retry_delay)
-                            retry_delay += 2  # Exponential backoff
-                        else:
-                            console.print(f"[red]   ✗ Query failed after {max_retries} attempts: {str(e)}[/red]")
-                            failed_queries.append(query)
-
-                # Longer delay between queries
-                if i < len(queries) - 1:  # Don't sleep after last query
-                    console.print("[dim]   Waiting to avoid rate limits...[/dim]")
-                    time.sleep(8)  # Increased from 2 to 8 seconds
-
-            except KeyboardInterrupt:
-                console.print("[yellow]\n⚠ Search interrupted by user[/yellow]")
-                break
-            except Exception as e:
-                console.print(f"[red]✗ Unexpected error with query '{query}': {str(e)}[/red]")
-                failed_queries.append(query)
-                continue
-
-        # Report results
-        if all_results:
-            console.print(f"[green]✓ Found {len(all_results)} total results from DuckDuckGo[/green]")
-        else:
-            console.print("[yellow]⚠ No results found from DuckDuckGo searches[/yellow]")
+        try:
+            # Hits are collected query by query as the scheduler returns them
+            for query, hits, error in self.ddg_scheduler().stream(queries, max_results=2):
+                if error is not None:
+                    failed_queries.append((query, str(error)))
+                    continue
+                for hit in hits:
+                    result.pastes.append(self._search_hit(hit, 'duckduckgo', query))
+        except (KeyboardInterrupt, DeadlineExceeded):
+            result.notes.append("Search interrupted before all queries ran")
 
+        for query, message in failed_queries:
+            result.error(f"Query '{query}' failed: {message}")
         if failed_queries:
-            console.print(f"[yellow]⚠ {len(failed_queries)} queries failed due to rate limiting[/yellow]")
-
-        return all_results
+            result.notes.append(f"{len(failed_queries)} queries failed due to rate limiting")
+
+        # Partial results are still results
+        if result.pastes:
+            result.status = FOUND
+            result.total = len(result.pastes)
+
+        return result
+
+    @staticmethod
+    def _search_hit(hit, source, query):
+        """Convert a raw DuckDuckGo hit into a PasteHit"""
+        return PasteHit(
+            title=hit.get('title', 'N/A'),
+            url=hit.get('href', 'N/A'),
+            source=source,
+            snippet=hit.get('body'),
+            query=query,
+        )
 
     def print_duckduckgo_results(self, results):
-        """Print DuckDuckGo results in organized format"""
-        if not results:
-            console.print("[yellow]No DuckDuckGo results found.[/yellow]")
-            return
-
-        # Group results by query
-        grouped = {}
-        for r in results:
-            query = r.get("query", "Unknown")
-            if query not in grouped:
-                grouped[query] = []
-            grouped[query].append(r)
-
-        for query, items in grouped.items():
-            if not items:
-                continue
-
-            console.print(f"\n[bold magenta]Results for: {query}[/bold magenta]")
-
-            table = Table(show_header=True, header_style="bold cyan")
-            table.add_column("Title", style="white", width=40)
-            table.add_column("URL", style="blue", width=50)
-            table.add_column("Description", style="dim white", width=60)
-
-            for item in items[:3]:  # Limit to top 3 per query
-                table.add_row(
-                    item.get('title', 'N/A')[:40] + "..." if len(item.get('title', '')) > 40 else item.get('title', 'N/A'),
-                    item.get('href', 'N/A'),
-                    item.get('body', 'N/A')[:60] + "..." if len(item.get('body', '')) > 60 else item.get('body', 'N/A')
-                )
-            console.print(table)
+        """Print DuckDuckGo results in organized format (PasteHits or raw DDG dicts)"""
+        report_renderer.render_search_hits([
+            self._search_hit(hit, 'duckduckgo', hit.get('query')) if isinstance(hit, dict) else hit
+            for hit in results
+        ])
 
     def check_social_media(self, email):
         """Check for social media accounts associated with email"""
-        console.print("[bold blue]🔍 Checking Social Media Associations...[/bold blue]")
+        result = SourceResult('social_media')
 
         # Basic social media search URLs
         social_sites = [
@@ -485,145 +505,310 @@ class EmailOSINT:
         ]
 
         for platform, url in social_sites:
-            console.print(f"[cyan]   {platform}:[/cyan] {url}")
+            result.links.append(ProfileField(platform, url))
+
+        return result
 
     def generate_report(self, email):
         """Generate a summary report"""
-        console.print("\n" + "="*80)
-        console.print(Panel.fit(
-            f"[bold]OSINT Report for: {email}[/bold]\n"
-            f"[dim]Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]",
-            border_style="green"
-        ))
+        report_renderer.render_header(EmailReport(email))
+
+    def _cached(self, source, endpoint, func, cache):
+        """Wrap a check so its answer is served from and stored in the response cache"""
+        if cache is None:
+            return func
+
+        def run(email, *args):
+            payload = cache.get(source, endpoint, email)
+            if payload is not None:
+                result = SourceResult.from_dict(payload)
+                result.cached = True
+                return result
+
+            result = func(email, *args)
+            # Errors, skipped sources and checks cut short by a deadline are never cached
+            limit = deadlines.current.get()
+            if result.status in (FOUND, CLEAN) and not (limit is not None and limit.expired()):
+                cache.set(source, endpoint, email, result.to_dict())
+            return result
+
+        return run
+
+    def findings_history(self):
+        """Last known answer per source and address, used by rescans"""
+        if self.history is None:
+            self.history = FindingsHistory.from_config(self.settings())
+        return self.history
+
+    def circuit_breakers(self):
+        """Per-source circuit breakers shared with every other run on this machine"""
+        if self.breakers is None:
+            self.breakers = CircuitBreakers.from_config(self.settings())
+        return self.breakers
+
+    def _guarded(self, breaker, source, func):
+        """Wrap a check so it is skipped while the upstream's circuit breaker is open"""
+        breakers = self.circuit_breakers()
+
+        def run(email, *args):
+            if not breakers.allow(breaker):
+                state = breakers.status(breaker)
+                result = SourceResult(source, status=SKIPPED)
+                retry_at = time.strftime('%H:%M:%S', time.localtime(state['open_until']))
+                last_error = _truncate(state['last_error'], 80) or 'unknown'
+                result.notes.append(f"Skipped: {breaker} has been failing ({state['failures']} failures in a row, "
+                                    f"last: {last_error}); next attempt after {retry_at}")
+                return result
 
-    def run_search(self, email, config=None):
-        """Main search function that orchestrates all checks"""
+            try:
+                result = func(email, *args)
+            except DeadlineExceeded:
+                # Our own time ran out: says nothing about the source
+                breakers.release(breaker)
+                raise
+            except Exception as e:
+                breakers.record(breaker, False, str(e))
+                raise
+            limit = deadlines.current.get()
+            if limit is not None and limit.expired():
+                # Stopped by our own deadline: says nothing about the source
+                breakers.release(breaker)
+            elif result.status == ERROR:
+                breakers.record(breaker, False, result.errors[-1].message if result.errors else None)
+            elif result.status != SKIPPED:
+                breakers.record(breaker, True)
+            else:
+                breakers.release(breaker)
+            return result
+
+        return run
+
+    def _build_jobs(self, email, config, cache=None):
+        """Build the list of independent source checks for a run"""
+        skip_ddg = config.get('skip_duckduckgo', False)
+
+        def cached(source, endpoint, func, breaker=None):
+            # Cached answers are served even while the source is down
+            return self._cached(source, endpoint, self._guarded(breaker or source, source, func), cache)
+
+        jobs = [
+            SourceJob('gravatar', 'Gravatar',
+                      cached('gravatar', 'profile', self.gravatar_lookup), (email,)),
+            SourceJob('hibp', 'Have I Been Pwned',
+                      cached('hibp', 'breachedaccount', self.check_haveibeenpwned), (email,)),
+            SourceJob('intelx', 'IntelX',
+                      cached('intelx', 'intelligent/search', self.check_intelx_email),
+                      (email, config.get('intelx_api_key'))),
+            SourceJob('dehashed', 'DeHashed',
+                      cached('dehashed', 'search', self.check_dehashed),
+                      (email, config.get('dehashed_api_key'))),
+            SourceJob('leakcheck', 'LeakCheck',
+                      cached('leakcheck', 'public', self.check_leakcheck),
+                      (email, config.get('leakcheck_api_key'))),
+            SourceJob('social_media', 'Social media', self.check_social_media, (email,), group='local'),
+        ]
+
+        # Breach directories and web searches both go through DuckDuckGo, so
+        # they share a rate-limit group and never run at the same time.
+        if not skip_ddg:
+            jobs.append(SourceJob('breach_directory', 'Breach directories',
+                                  cached('breach_directory', 'paste-sites', self.check_breach_directory,
+                                         breaker='duckduckgo'),
+                                  (email,), group='duckduckgo'))
+            jobs.append(SourceJob('duckduckgo', 'Web searches',
+                                  cached('duckduckgo', 'text', self.duckduckgo_email_search),
+                                  (email,), group='duckduckgo'))
+
+        return jobs
+
+    async def collect_async(self, email, config=None, show_progress=True, cache=None, events=None,
+                            deadline=None, rescan=False):
+        """Run all checks concurrently and combine their results into an EmailReport
+
+        cache overrides the instance's response cache for this call only;
+        events (an EventStream) receives each source's result as it finishes.
+        Sources still running when deadline (a utils.deadline.Deadline) runs
+        out, or that use up their "source_budgets" entry, are recorded as
+        timed out and the report holds whatever finished.
+
+        With rescan, sources whose last answer for this address is still
+        inside its freshness window are not queried again, and report.changes
+        lists what the queried ones found or no longer found since then.
+        """
+        if config is None:
+            config = self.settings()
+        elif self.config is None:
+            self.config = config
+
+        report = EmailReport(email)
+        engine = self.engine or SourceEngine(config.get('source_concurrency'))
+        if self.cache is None:
+            self.cache = ResponseCache.from_config(config)
+        cache = cache or self.cache
+        if self.state is None:
+            self.state = StateStore.from_config(config)
+        if self.ddg is None:
+            self.ddg = get_scheduler(config)
+        history = self.findings_history()
+
+        previous = history.load(email) if rescan else {}
+        reuse = history.fresh(previous)
+        if rescan:
+            # Stale sources are asked again, not answered from the response cache
+            # (fresh answers are still stored in it)
+            cache = copy.copy(cache)
+            cache.refresh = True
+        jobs = self._build_jobs(email, config, cache)
+        reused = [job.name for job in jobs if job.name in reuse]
+        jobs = [job for job in jobs if job.name not in reuse]
+
+        budgets = config.get('source_budgets')
+        # --refresh / --no-cache: no DuckDuckGo answers remembered from earlier runs
+        fresh = memo_not_before.set(time.time()) if cache.refresh or not cache.enabled else None
+        try:
+            if show_progress and events is None:
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console,
+                ) as progress:
+                    results = await engine.run(jobs, progress, deadline=deadline, budgets=budgets)
+            else:
+                results = await engine.run(jobs, events=events, deadline=deadline, budgets=budgets)
+        finally:
+            if fresh is not None:
+                memo_not_before.reset(fresh)
+
+        for name, result in results.items():
+            if isinstance(result, DeadlineExceeded):
+                result = SourceResult.stopped(name, str(result))
+            elif isinstance(result, Exception):
+                result = SourceResult(name).error(str(result))
+            report.add(result)
+        history.save(report)
+
+        for name in reused:
+            result = reuse[name]['result']
+            result.cached = True
+            checked = time.strftime('%Y-%m-%d %H:%M', time.localtime(reuse[name]['checked_at']))
+            result.notes.append(f"Not re-queried: last checked {checked}, still fresh")
+            report.add(result)
+            if events is not None:
+                events.source_finished(name, result, 0.0)
+
+        if rescan:
+            last = max((entry['checked_at'] for entry in previous.values()), default=None)
+            report.changes = diff_results(
+                email, {name: entry['result'] for name, entry in previous.items()}, {name: report.results[name] for name in results},
+                time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last)) if last else None,
+            )
+            report.changes.rescanned = list(results)
+            report.changes.reused = reused
+
+        return report
+
+    async def run_search_async(self, email, config=None, deadline=None, rescan=False):
+        """Collect findings concurrently, render them and return the EmailReport"""
         if config is None:
             config = load_config()
 
         console.print(f"[bold green]🎯 Starting comprehensive OSINT search for:[/bold green] [cyan]{email}[/cyan]\n")
 
         # Validate email format
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not is_valid_email(email):
             console.print("[red]✗ Invalid email format provided[/red]")
-            return
+            return None
 
         # Check if DuckDuckGo searches should be skipped
         skip_ddg = config.get('skip_duckduckgo', False)
         if skip_ddg:
             console.print("[yellow]⚠ DuckDuckGo searches disabled in config[/yellow]")
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-
-            # Gravatar lookup
-            task = progress.add_task("[cyan]Checking Gravatar...", total=None)
-            self.gravatar_lookup(email)
-            progress.remove_task(task)
-
-            # Have I Been Pwned
-            task = progress.add_task("[cyan]Checking breaches...", total=None)
-            self.check_haveibeenpwned(email)
-            progress.remove_task(task)
-
-            # IntelligenceX
-            task = progress.add_task("[cyan]Checking IntelX...", total=None)
-            self.check_intelx_email(email, config.get('intelx_api_key'))
-            progress.remove_task(task)
-
-            # DeHashed
-            task = progress.add_task("[cyan]Checking DeHashed...", total=None)
-            self.check_dehashed(email, config.get('dehashed_api_key'))
-            progress.remove_task(task)
-
-            # LeakCheck
-            task = progress.add_task("[cyan]Checking LeakCheck...", total=None)
-            self.check_leakcheck(email, config.get('leakcheck_api_key'))
-            progress.remove_task(task)
-
-            # Breach directories (only if DDG not disabled)
-            if not skip_ddg:
-                task = progress.add_task("[cyan]Checking breach directories...", total=None)
-                self.check_breach_directory(email)
-                progress.remove_task(task)
-
-            # Social media
-            task = progress.add_task("[cyan]Checking social media...", total=None)
-            self.check_social_media(email)
-            progress.remove_task(task)
-
-            # DuckDuckGo search (only if not disabled)
-            if not skip_ddg:
-                task = progress.add_task("[cyan]Performing web searches...", total=None)
-                ddg_results = self.duckduckgo_email_search(email)
-                self.print_duckduckgo_results(ddg_results)
-                progress.remove_task(task)
-            else:
-                console.print("[yellow]⚠ Skipping DuckDuckGo searches (disabled in config)[/yellow]")
+        report = await self.collect_async(email, config, deadline=deadline, rescan=rescan)
+        report_renderer.render_report(report)
 
-        # Generate final report
-        self.generate_report(email)
+        if skip_ddg:
+            console.print("[yellow]⚠ Skipping DuckDuckGo searches (disabled in config)[/yellow]")
 
         console.print(f"\n[bold green]✅ Search completed for {email}[/bold green]")
         console.print("[dim]Remember to verify any findings through additional sources[/dim]")
 
+        return report
 
-def load_config():
-    """Load API keys from config file"""
-    config = {}
+    def run_search(self, email, config=None):
+        """Main search function that orchestrates all checks"""
+        return asyncio.run(self.run_search_async(email, config))
 
-    # Look for config file in same directory as script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, '..', 'config.json')
 
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-    except FileNotFoundError:
-        console.print("[yellow]⚠ No config.json found. API-dependent features will be limited.[/yellow]")
-        console.print("[dim]Create a config.json file with your API keys for full functionality.[/dim]\n")
-    except Exception as e:
-        console.print(f"[red]✗ Error loading config: {str(e)}[/red]")
+def search_by_email(email, use_cache=True, refresh=False, rescan=False):
+    """
+    Main function to be called from main.py
 
-    return config
+    Args:
+        email (str): Email address to investigate
+        use_cache (bool): Read and write the local response cache
+        refresh (bool): Ignore cached answers but store the fresh ones
+        rescan (bool): Only re-query stale sources and report what changed
 
+    Returns:
+        EmailReport: Structured findings, or None if the email is invalid
+    """
+    return asyncio.run(search_by_email_async(email, use_cache, refresh, rescan=rescan))
 
-def search_by_email(email):
+
+async def search_by_email_async(email, use_cache=True, refresh=False, events=None, deadline=None,
+                                rescan=False):
     """
-    Main function to be called from main.py
+    Async variant of search_by_email for callers already inside an event loop
 
     Args:
         email (str): Email address to investigate
+        use_cache (bool): Read and write the local response cache
+        refresh (bool): Ignore cached answers but store the fresh ones
+        events (EventStream): Emit per-source events instead of rendering
+        deadline (Deadline): Stop sources still running when it runs out
+        rescan (bool): Only re-query stale sources and report what changed
+
+    Returns:
+        EmailReport: Structured findings, or None if the email is invalid
     """
-    osint_tool = EmailOSINT()
-    osint_tool.run_search(email)
+    config = load_config()
+    cache = ResponseCache.from_config(config, enabled=use_cache, refresh=refresh)
+    osint_tool = EmailOSINT(cache=cache)
+    if events is None:
+        return await osint_tool.run_search_async(email, config, deadline, rescan)
+
+    if not is_valid_email(email):
+        events.emit('error', source='email', errors=[{'source': 'email', 'message': 'Invalid email format'}])
+        return None
+    return await osint_tool.collect_async(email, config, events=events, deadline=deadline, rescan=rescan)
 
 
 # For backward compatibility with your existing code
 def gravatar_lookup(email):
     """Backward compatibility function"""
     osint_tool = EmailOSINT()
-    osint_tool.gravatar_lookup(email)
+    result = osint_tool.gravatar_lookup(email)
+    report_renderer.render_result(result)
+    return result
 
 
 def check_intelx_email(email, api_key=None):
     """Backward compatibility function"""
     osint_tool = EmailOSINT()
-    osint_tool.check_intelx_email(email, api_key)
+    result = osint_tool.check_intelx_email(email, api_key)
+    report_renderer.render_result(result)
+    return result
 
 
 def duckduckgo_email_search(email):
-    """Backward compatibility function"""
+    """Backward compatibility function: raw DDG dicts (title, href, body, query)"""
     osint_tool = EmailOSINT()
-    return osint_tool.duckduckgo_email_search(email)
+    return [{'title': hit.title, 'href': hit.url, 'body': hit.snippet, 'query': hit.query}
+            for hit in osint_tool.duckduckgo_email_search(email).pastes]
 
 
 def print_duckduckgo_results(results):
     """Backward compatibility function"""
     osint_tool = EmailOSINT()
     osint_tool.print_duckduckgo_results(results)
-
@@ -0,0 +1,74 @@
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict
+
+from utils.deadline import DeadlineExceeded
+from utils.models import ERROR, SourceResult
+
+
+def disable_rich():
+    """Silence every Rich console so only events reach stdout"""
+    from utils import analyzers, bulk_audit, email_lookup, report_renderer
+    for module in (analyzers, bulk_audit, email_lookup, report_renderer):
+        module.console.quiet = True
+
+
+class EventStream:
+    """
+    Newline-delimited JSON events for headless runs (--format ndjson)
+
+    Each source produces a "start" event when it begins, a "result" (or
+    "error") event as soon as it finishes and a "timing" event; the run ends
+    with one "summary" event. Every line is flushed immediately so consumers
+    can act on partial results.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.started = time.perf_counter()
+        self.statuses: Counter = Counter()
+
+    def emit(self, event: str, **fields):
+        record = {'event': event, 't': round(time.perf_counter() - self.started, 3)}
+        record.update(fields)
+        self.stream.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+        self.stream.flush()
+
+    # Called by SourceEngine from the event loop thread
+
+    def source_started(self, name: str, waited: float = 0.0):
+        self.emit('start', source=name, waited=round(waited, 3))
+
+    def source_finished(self, name: str, result, elapsed: float):
+        status = getattr(result, 'status', None)
+        self.statuses[status] += 1
+        data = result.to_dict() if hasattr(result, 'to_dict') else result
+        if status == ERROR:
+            self.emit('error', source=name, errors=data.get('errors', []), result=data)
+        else:
+            self.emit('result', source=name, status=status, cached=getattr(result, 'cached', False), result=data)
+        self.emit('timing', source=name, elapsed=round(elapsed, 3))
+
+    def source_failed(self, name: str, error: Exception, elapsed: float):
+        if isinstance(error, DeadlineExceeded):
+            self.source_finished(name, SourceResult.stopped(name, str(error)), elapsed)
+            return
+        self.statuses[ERROR] += 1
+        self.emit('error', source=name, errors=[{'source': name, 'message': str(error)}])
+        self.emit('timing', source=name, elapsed=round(elapsed, 3))
+
+    def summary(self, report=None, **fields: Any):
+        """Final event: per-status counts, totals and the run's wall time"""
+        data: Dict[str, Any] = {'sources': dict(self.statuses), 'elapsed': round(time.perf_counter() - self.started, 3)}
+        if report is not None:
+            data.update(
+                email=report.email,
+                breaches=len(report.breaches),
+                hits=len(report.hits),
+                errors=len(report.errors),
+            )
+        data.update(fields)
+        self.emit('summary', **data)
+
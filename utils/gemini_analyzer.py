@@ -1,26 +1,6 @@
-import os
-import json
-from typing import Dict, Any
-import google.generativeai as genai
-from rich.console import Console
-
-console = Console()
-
-def load_config():
-    """Load configuration from config file"""
-    config = {}
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, '..', 'config.json')
-
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-    except FileNotFoundError:
-        console.print("[yellow]⚠ No config.json found. Gemini analysis will be disabled.[/yellow]")
-    except Exception as e:
-        console.print(f"[red]✗ Error loading config: {str(e)}[/red]")
-
-    return config
+import asyncio
+from typing import AsyncIterator, Dict, Any
+from utils.analyzers import BaseAnalyzer
 
 def get_mock_analysis(data: Dict[str, Any]) -> str:
     """Provide a mock analysis for testing purposes"""
@@ -40,39 +20,45 @@ def get_mock_analysis(data: Dict[str, Any]) -> str:
 - Verify your API quota and billing
 - Review collected data manually"""
 
-class GeminiAnalyzer:
-    def __init__(self, test_mode=True):
-        self.config = load_config()
-        self.api_key = self.config.get('gemini_api_key')
-        self.test_mode = test_mode
-        
-        if not self.api_key and not self.test_mode:
-            raise ValueError("Gemini API key not found in config.json")
-            
-        if not self.test_mode:
+class GeminiAnalyzer(BaseAnalyzer):
+    PROVIDER = 'gemini'
+    LABEL = 'Gemini'
+    DEFAULT_MODEL = 'gemini-pro'
+    mock_analysis = staticmethod(get_mock_analysis)
+
+    def _setup_client(self):
+        # Imported here so test runs and other analyzers never load the SDK
+        import google.generativeai as genai
+        endpoint = self.config.get('gemini_api_endpoint')
+        self.rest_transport = bool(endpoint)
+        if endpoint:
+            # Alternative REST endpoint (proxy, benchmark stand-in)
+            genai.configure(api_key=self.api_key, transport='rest', client_options={'api_endpoint': endpoint})
+        else:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-pro')
+        self.model = genai.GenerativeModel(self.model_name)
 
-    async def analyze_findings(self, data: Dict[str, Any]) -> str:
-        """Analyze OSINT findings using Gemini or fallback to mock analysis"""
-        if self.test_mode:
-            console.print("[yellow]⚠ Running in test mode - using mock analysis[/yellow]")
-            return get_mock_analysis(data)
-            
-        prompt = self._create_analysis_prompt(data)
-        
-        try:
-            response = await self.model.generate_content_async(prompt)
-            return response.text
-        except Exception as e:
-            console.print(f"[red]✗ Gemini API call failed: {str(e)}[/red]")
-            console.print("[yellow]ℹ Falling back to mock analysis[/yellow]")
-            return get_mock_analysis(data)
+    async def _stream_completion(self, prompt: str) -> AsyncIterator[str]:
+        if self.rest_transport:
+            # The SDK has no async REST client; stream from a worker thread instead
+            response = await asyncio.to_thread(self.model.generate_content, prompt, stream=True)
+            chunks = iter(response)
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                if chunk.text:
+                    yield chunk.text
+            return
+
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
 
     def _create_analysis_prompt(self, data: Dict[str, Any]) -> str:
+        prompt_data = self._prompt_data(data)
         return f"""Analyze the following OSINT (Open Source Intelligence) data and provide detailed insights:
         
-Data collected: {data}
+Data collected ({prompt_data.summary()}, compact JSON):
+{prompt_data.text}
 
 Provide a structured analysis with:
 1. Key findings and patterns in the data
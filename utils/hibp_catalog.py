@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.cache import DAY, HOUR, connect, default_cache_dir
+from utils.tracing import span
+
+DEFAULT_CATALOG_TTL = DAY
+# A breach name missing from the catalog forces an early refresh, at most this often
+MIN_REFRESH_INTERVAL = HOUR
+
+
+class BreachCatalog:
+    """
+    Local copy of the HIBP /breaches listing, indexed by breach name
+
+    The metadata of a breach (dates, data classes, descriptions) is the same
+    for every account, so it is downloaded once per refresh window and
+    per-account lookups only need the truncated list of names.
+    """
+
+    def __init__(self, session, base_url: str, path: Optional[str] = None,
+                 ttl: float = DEFAULT_CATALOG_TTL):
+        self.session = session
+        self.base_url = base_url
+        self.path = path or os.path.join(default_cache_dir(), 'data-gather.db')
+        self.ttl = ttl
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, session, base_url: str, config: Dict[str, Any]) -> 'BreachCatalog':
+        cache_dir = config.get('cache_dir') or default_cache_dir()
+        return cls(session, base_url, os.path.join(cache_dir, 'data-gather.db'),
+                   ttl=float(config.get('hibp_catalog_ttl', DEFAULT_CATALOG_TTL)))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.path)
+        if not self._ready:
+            conn.execute('''CREATE TABLE IF NOT EXISTS hibp_breaches (
+                name TEXT PRIMARY KEY,
+                payload TEXT NOT NULL
+            )''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS hibp_catalog_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                etag TEXT,
+                refreshed_at REAL NOT NULL,
+                count INTEGER NOT NULL
+            )''')
+            self._ready = True
+        return conn
+
+    def _meta(self) -> Optional[tuple]:
+        try:
+            conn = self._connect()
+            try:
+                return conn.execute('SELECT etag, refreshed_at, count FROM hibp_catalog_meta').fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+
+    def stale(self) -> bool:
+        meta = self._meta()
+        return meta is None or meta[1] + self.ttl <= time.time()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Download the listing when it is stale (or forced); returns True when the catalog is usable"""
+        with self._lock:
+            meta = self._meta()
+            if not force and meta is not None and meta[1] + self.ttl > time.time():
+                return True
+
+            headers = {'If-None-Match': meta[0]} if meta and meta[0] else {}
+            with span('hibp catalog refresh', 'source') as current:
+                try:
+                    response = self.session.get(f"{self.base_url}/breaches", headers=headers, timeout=30)
+                except Exception:
+                    current.set(status='error')
+                    return meta is not None
+                current.set(status=response.status_code)
+                if response.status_code == 304 and meta is not None:
+                    self._touch(meta[0], meta[2])
+                    return True
+                if response.status_code != 200:
+                    # An outdated catalog is still better than none
+                    return meta is not None
+                try:
+                    breaches = response.json()
+                except ValueError:
+                    return meta is not None
+                self._store(breaches, response.headers.get('ETag'))
+                current.set(breaches=len(breaches))
+                return True
+
+    def _touch(self, etag: Optional[str], count: int):
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('INSERT OR REPLACE INTO hibp_catalog_meta VALUES (0, ?, ?, ?)',
+                             (etag, time.time(), count))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _store(self, breaches: List[Dict[str, Any]], etag: Optional[str]):
+        rows = [(breach['Name'].lower(), json.dumps(breach, separators=(',', ':')))
+                for breach in breaches if breach.get('Name')]
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('BEGIN')
+                conn.execute('DELETE FROM hibp_breaches')
+                conn.executemany('INSERT OR REPLACE INTO hibp_breaches VALUES (?, ?)', rows)
+                conn.execute('INSERT OR REPLACE INTO hibp_catalog_meta VALUES (0, ?, ?, ?)',
+                             (etag, time.time(), len(rows)))
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Full catalog entry for a breach, available offline once downloaded"""
+        return self.lookup([name]).get(name)
+
+    def lookup(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Catalog entries for the given breach names (missing names are left out)"""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        wanted = {name.lower(): name for name in names}
+        found = {}
+        try:
+            conn = self._connect()
+            try:
+                placeholders = ','.join('?' * len(wanted))
+                for key, payload in conn.execute(
+                        f'SELECT name, payload FROM hibp_breaches WHERE name IN ({placeholders})',
+                        list(wanted)):
+                    found[wanted[key]] = json.loads(payload)
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError):
+            return {}
+        return found
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Join breach names against the catalog, refreshing it first when stale
+
+        Names the catalog does not know yet (a breach added since the last
+        download) trigger one early refresh, rate-limited across runs.
+        """
+        names = list(names)
+        self.refresh()
+        found = self.lookup(names)
+        if len(found) < len(set(names)):
+            meta = self._meta()
+            if meta is None or meta[1] + MIN_REFRESH_INTERVAL <= time.time():
+                self.refresh(force=True)
+                found = self.lookup(names)
+        return found
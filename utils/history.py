@@ -0,0 +1,160 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from utils.cache import DAY, HOUR, connect, default_cache_dir, normalize_target
+from utils.hit_index import normalize_url
+from utils.models import CLEAN, FOUND, EmailReport, ReportDiff, SourceResult
+
+# How long a stored answer is trusted by --rescan before the source is asked
+# again, per source; override with "rescan_windows" in config.json.
+DEFAULT_WINDOWS = {
+    'gravatar': 7 * DAY,
+    'hibp': DAY,
+    'intelx': DAY,
+    'dehashed': DAY,
+    'leakcheck': DAY,
+    'breach_directory': 12 * HOUR,
+    'duckduckgo': 12 * HOUR,
+    'social_media': 30 * DAY,
+}
+DEFAULT_WINDOW = DAY
+
+
+class FindingsHistory:
+    """
+    Last known answer of every source for every scanned target
+
+    Only definite answers (found / clean) are stored, so a source that
+    failed or was skipped keeps its previous answer. --rescan reuses answers
+    still inside their freshness window and compares the rest with what the
+    sources return now.
+    """
+
+    def __init__(self, path: Optional[str] = None, windows: Optional[Dict[str, float]] = None,
+                 enabled: bool = True):
+        self.path = path or os.path.join(default_cache_dir(), 'data-gather.db')
+        self.windows = dict(DEFAULT_WINDOWS)
+        if windows:
+            self.windows.update(windows)
+        self.enabled = enabled
+        self._ready = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'FindingsHistory':
+        cache_dir = config.get('cache_dir') or default_cache_dir()
+        return cls(os.path.join(cache_dir, 'data-gather.db'), windows=config.get('rescan_windows'),
+                   enabled=not config.get('disable_history', False))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = connect(self.path)
+        if not self._ready:
+            conn.execute('''CREATE TABLE IF NOT EXISTS history (
+                target TEXT NOT NULL,
+                source TEXT NOT NULL,
+                result TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (target, source)
+            )''')
+            self._ready = True
+        return conn
+
+    def load(self, target: str) -> Dict[str, Dict[str, Any]]:
+        """{source: {'result': SourceResult, 'checked_at': epoch}} for the target's last answers"""
+        if not self.enabled:
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute('SELECT source, result, checked_at FROM history WHERE target = ?',
+                                    (normalize_target(target),)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return {}
+        entries = {}
+        for source, payload, checked_at in rows:
+            try:
+                entries[source] = {'result': SourceResult.from_dict(json.loads(payload)), 'checked_at': checked_at}
+            except (ValueError, TypeError):
+                continue
+        return entries
+
+    def fresh(self, entries: Dict[str, Dict[str, Any]], now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """The entries still inside their source's freshness window"""
+        now = now or time.time()
+        return {source: entry for source, entry in entries.items()
+                if now - entry['checked_at'] < self.windows.get(source, DEFAULT_WINDOW)}
+
+    def save(self, report: EmailReport, sources: Optional[Iterable[str]] = None):
+        """Store the definite answers of a report (only for sources when given)
+
+        Answers served from the response cache are skipped: their source
+        was not asked now, so stamping them with the current time would
+        stretch the freshness window past the answer's real age. Answers
+        cut short by the deadline are skipped too, so they never replace a
+        complete one.
+        """
+        if not self.enabled:
+            return
+        names = set(sources) if sources is not None else set(report.results)
+        now = time.time()
+        rows = []
+        for name, result in report.results.items():
+            if (name not in names or result.status not in (FOUND, CLEAN) or result.cached
+                    or result.truncated):
+                continue
+            data = result.to_dict()
+            data.pop('elapsed', None)
+            rows.append((normalize_target(report.email), name, json.dumps(data, separators=(',', ':')), now))
+        if not rows:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany('INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?)', rows)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def _difference(before, after, key):
+    """Items only in after, and items only in before, matched by key"""
+    before_keys = {key(item) for item in before}
+    after_keys = {key(item) for item in after}
+    return ([item for item in after if key(item) not in before_keys],
+            [item for item in before if key(item) not in after_keys])
+
+
+def diff_results(email: str, previous: Dict[str, SourceResult], current: Dict[str, SourceResult],
+                 previous_scan: Optional[str] = None) -> ReportDiff:
+    """
+    Compare two sets of per-source answers
+
+    Only sources with a complete, definite answer on both sides are
+    compared, so a source that failed or was cut short this time never
+    shows its findings as removed.
+    """
+    diff = ReportDiff(email, previous_scan)
+    compared = [name for name, result in current.items()
+                if result.status in (FOUND, CLEAN) and not result.truncated
+                and name in previous and not previous[name].truncated]
+
+    def collect(attribute):
+        return ([item for name in compared for item in getattr(previous[name], attribute)],
+                [item for name in compared for item in getattr(current[name], attribute)])
+
+    diff.new_breaches, diff.removed_breaches = _difference(
+        *collect('breaches'), key=lambda b: (b.source, b.name.lower()))
+    diff.new_credentials, diff.removed_credentials = _difference(
+        *collect('credentials'), key=lambda c: (c.database, c.username, c.hashed_password or c.password))
+    diff.new_records, diff.removed_records = _difference(
+        *collect('records'), key=lambda r: (r.source, r.name))
+    # The same page found by both search sources is one hit
+    new_hits, removed_hits = _difference(*collect('pastes'), key=lambda p: normalize_url(p.url))
+    diff.new_hits = list({normalize_url(p.url): p for p in new_hits}.values())
+    diff.removed_hits = list({normalize_url(p.url): p for p in removed_hits}.values())
+    return diff
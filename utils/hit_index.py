@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, Iterator, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utils.models import PasteHit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref_src', 'ref_url', 'spm', '_ga', 'yclid',
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL used to spot duplicates
+
+    http and https are treated alike, the host is lowercased (without
+    'www.' and default ports), tracking parameters and fragments are
+    dropped, remaining parameters are sorted and trailing slashes removed.
+    """
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    if not parts.netloc:
+        return url.strip().rstrip('/')
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip('/')
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(('https' if scheme in DEFAULT_PORTS else scheme, host, path, urlencode(params), ''))
+
+
+def _append_unique(items: List[str], value):
+    if value and value not in items:
+        items.append(value)
+
+
+class HitIndex:
+    """Merge search hits that point to the same page, in a single pass"""
+
+    def __init__(self, hits: Iterable[PasteHit] = ()):
+        self._hits: Dict[str, PasteHit] = {}
+        self.added = 0
+        self.extend(hits)
+
+    def add(self, hit: PasteHit) -> PasteHit:
+        """Add a hit and return the merged hit it now belongs to"""
+        self.added += 1
+        key = normalize_url(hit.url) or hit.title
+        merged = self._hits.get(key)
+        if merged is None:
+            merged = PasteHit(
+                title=hit.title,
+                url=hit.url,
+                source=hit.source,
+                snippet=hit.snippet,
+                query=hit.query,
+                queries=list(hit.queries),
+                sources=list(hit.sources),
+            )
+            self._hits[key] = merged
+        elif hit.snippet and len(hit.snippet) > len(merged.snippet or ''):
+            merged.snippet = hit.snippet
+
+        _append_unique(merged.queries, hit.query)
+        _append_unique(merged.sources, hit.source)
+        for query in hit.queries:
+            _append_unique(merged.queries, query)
+        for source in hit.sources:
+            _append_unique(merged.sources, source)
+        return merged
+
+    def extend(self, hits: Iterable[PasteHit]):
+        for hit in hits:
+            self.add(hit)
+
+    @property
+    def hits(self) -> List[PasteHit]:
+        return list(self._hits.values())
+
+    @property
+    def duplicates(self) -> int:
+        return self.added - len(self._hits)
+
+    def __iter__(self) -> Iterator[PasteHit]:
+        return iter(self._hits.values())
+
+    def __len__(self) -> int:
+        return len(self._hits)
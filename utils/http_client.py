@@ -0,0 +1,218 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.request import ACCEPT_ENCODING
+
+from utils import deadline
+from utils.config import load_config
+from utils.tracing import instrument_session
+
+# Connections kept open per host. Hosts not listed get DEFAULT_POOL_SIZE;
+# "http_pool_sizes" in config.json overrides or extends this.
+DEFAULT_POOL_SIZES = {
+    'www.gravatar.com': 8,
+    'haveibeenpwned.com': 2,
+    'api.dehashed.com': 4,
+    'leakcheck.io': 4,
+    'free.intelx.io': 4,
+    '2.intelx.io': 4,
+    'public.intelx.io': 4,
+}
+DEFAULT_POOL_SIZE = 10
+# Number of per-host pools kept alive at once
+MAX_HOSTS = 32
+DEFAULT_DNS_TTL = 300
+# Hosts kept in the DNS cache
+DEFAULT_DNS_ENTRIES = 256
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+class DNSCache:
+    """
+    TTL cache of resolved addresses for this package's HTTP sessions
+
+    New pooled connections to a host we already resolved skip the lookup.
+    Only successful answers are cached, expired and least recently used
+    entries are dropped beyond max_entries, and the rest of the process
+    (aiohttp, the daemon, third-party SDKs) keeps resolving normally.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL, max_entries: int = DEFAULT_DNS_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses to try for host, in getaddrinfo order"""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+        infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_dns_cache: Optional[DNSCache] = None
+
+
+def install_dns_cache(ttl: float = DEFAULT_DNS_TTL, max_entries: int = DEFAULT_DNS_ENTRIES) -> Optional[DNSCache]:
+    """Resolve connections of the sessions built here through a shared DNSCache (ttl <= 0 disables it)"""
+    global _dns_cache
+    if ttl <= 0:
+        _dns_cache = None
+        return None
+    if _dns_cache is None:
+        _dns_cache = DNSCache(ttl, max_entries)
+    _dns_cache.ttl = ttl
+    _dns_cache.max_entries = max_entries
+    return _dns_cache
+
+
+class _CachedDNSConnection:
+    """Connection mixin that connects to the cached addresses of its host"""
+
+    def _new_conn(self):
+        cache = _dns_cache
+        host = self._dns_host
+        try:
+            addresses = cache.resolve(host, self.port) if cache is not None else None
+        except OSError:
+            addresses = None
+        if not addresses:
+            # Let urllib3 resolve and report the failure itself
+            return super()._new_conn()
+
+        # TLS still verifies and sends SNI for self.host, only the connect uses the address
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError as e:
+                    error = e
+            # The host may have moved: resolve it again next time
+            cache.forget(host, self.port)
+            raise error
+        finally:
+            self._dns_host = host
+
+
+class _CachedHTTPConnection(_CachedDNSConnection, HTTPConnection):
+    pass
+
+
+class _CachedHTTPSConnection(_CachedDNSConnection, HTTPSConnection):
+    pass
+
+
+class _CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedHTTPConnection
+
+
+class _CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedHTTPSConnection
+
+
+class _Adapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve hosts through the DNS cache"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CachedHTTPConnectionPool,
+            'https': _CachedHTTPSConnectionPool,
+        }
+
+
+def _adapter(pool_size: int) -> HTTPAdapter:
+    return _Adapter(pool_connections=MAX_HOSTS, pool_maxsize=pool_size, pool_block=False)
+
+
+def bound_to_deadline(session: requests.Session) -> requests.Session:
+    """Clamp request timeouts to the calling source's remaining time budget"""
+    request = session.request
+
+    def bounded_request(method, url, *args, **kwargs):
+        if deadline.current.get() is not None:
+            kwargs['timeout'] = deadline.clamp_timeout(kwargs.get('timeout'))
+        return request(method, url, *args, **kwargs)
+
+    session.request = bounded_request
+    return session
+
+
+def build_session(config: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Session:
+    """A requests session with keep-alive pools sized per host and compressed responses"""
+    config = config if config is not None else load_config()
+    session = requests.Session()
+    # gzip/deflate always; br and zstd too when urllib3 can decode them
+    session.headers.update({'Accept-Encoding': ACCEPT_ENCODING, 'Connection': 'keep-alive'})
+    if headers:
+        session.headers.update(headers)
+
+    default_size = int(config.get('http_pool_size', DEFAULT_POOL_SIZE))
+    session.mount('https://', _adapter(default_size))
+    session.mount('http://', _adapter(default_size))
+    for host, size in {**DEFAULT_POOL_SIZES, **(config.get('http_pool_sizes') or {})}.items():
+        session.mount(f"https://{host}", _adapter(int(size)))
+
+    install_dns_cache(float(config.get('dns_cache_ttl', DEFAULT_DNS_TTL)),
+                      int(config.get('dns_cache_size', DEFAULT_DNS_ENTRIES)))
+    return instrument_session(bound_to_deadline(session))
+
+
+def get_session(name: str = 'default', config: Optional[Dict] = None,
+                headers: Optional[Dict] = None) -> requests.Session:
+    """
+    Process-wide session for a client name
+
+    Every EmailOSINT, helper function and search backend asking for the
+    same name shares one set of keep-alive pools, so repeated requests to a
+    host reuse open TCP/TLS connections. headers are only applied when the
+    session is first created.
+    """
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = _sessions[name] = build_session(config, headers)
+        return session
+
+
+def close_sessions():
+    """Close every pooled connection (tests, daemon shutdown)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
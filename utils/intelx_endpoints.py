@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import as_completed
+from typing import Optional
+
+from utils.cache import DAY, StateStore
+from utils.deadline import DeadlineExceeded, WorkerPool
+
+# Candidate base URLs, in order of preference
+INTELX_ENDPOINTS = [
+    "https://leakcheck.io/api/public",
+    "https://leakcheck.io/api/v2",
+    "https://free.intelx.io",
+    "https://2.intelx.io",
+    "https://public.intelx.io",
+    "https://www.intelx.io/apiv2",
+]
+
+STATE_KEY = 'intelx:endpoints'
+
+
+class EndpointDirectory:
+    """Find a healthy IntelX base URL and remember it across runs"""
+
+    def __init__(self, session, store: Optional[StateStore] = None, endpoints=None,
+                 ttl: float = DAY, probe_timeout: float = 10):
+        self.session = session
+        self.store = store or StateStore()
+        self.endpoints = list(endpoints or INTELX_ENDPOINTS)
+        self.ttl = ttl
+        self.probe_timeout = probe_timeout
+
+    def _load(self):
+        return self.store.get(STATE_KEY) or {'winner': None, 'expires_at': 0, 'stats': {}}
+
+    def _save(self, state):
+        self.store.set(STATE_KEY, state)
+
+    def _probe(self, endpoint, api_key):
+        """Check one endpoint; returns (healthy, latency in seconds)"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                f"{endpoint}/authenticate/info",
+                headers={'x-key': api_key},
+                timeout=self.probe_timeout
+            )
+            healthy = response.status_code == 200
+        except DeadlineExceeded:
+            # Out of time says nothing about the endpoint
+            raise
+        except Exception:
+            healthy = False
+        return healthy, time.perf_counter() - start
+
+    @staticmethod
+    def _record(state, endpoint, healthy, latency):
+        stats = state['stats'].setdefault(endpoint, {'ok': 0, 'failed': 0, 'latency': None})
+        if healthy:
+            stats['ok'] += 1
+            # Exponential moving average of healthy probe latency
+            previous = stats['latency']
+            stats['latency'] = round(latency if previous is None else 0.7 * previous + 0.3 * latency, 3)
+        else:
+            stats['failed'] += 1
+        stats['checked_at'] = time.time()
+
+    def _set_winner(self, state, endpoint):
+        state['winner'] = endpoint
+        state['expires_at'] = time.time() + self.ttl if endpoint else 0
+        self._save(state)
+
+    def resolve(self, api_key) -> Optional[str]:
+        """Return a working base URL, probing only when no fresh winner is known"""
+        state = self._load()
+        winner = state.get('winner')
+        if winner not in self.endpoints:
+            # Remembered from a different endpoint list (config changed)
+            winner = None
+        if winner and state.get('expires_at', 0) > time.time():
+            return winner
+
+        # The last known-good endpoint is the most likely to still work
+        if winner:
+            healthy, latency = self._probe(winner, api_key)
+            self._record(state, winner, healthy, latency)
+            if healthy:
+                self._set_winner(state, winner)
+                return winner
+
+        return self.discover(api_key, state)
+
+    def discover(self, api_key, state=None) -> Optional[str]:
+        """Probe every candidate at once and keep the first healthy one"""
+        state = state or self._load()
+        # Try historically faster endpoints first when submitting probes
+        candidates = sorted(
+            self.endpoints,
+            key=lambda e: state['stats'].get(e, {}).get('latency') or float('inf')
+        )
+
+        winner = None
+        # Probes follow the check's deadline and never hold the process open
+        executor = WorkerPool(len(candidates), name='intelx-probe')
+        try:
+            futures = {executor.submit(self._probe, e, api_key): e for e in candidates}
+            for future in as_completed(futures):
+                endpoint = futures[future]
+                healthy, latency = future.result()
+                self._record(state, endpoint, healthy, latency)
+                if healthy:
+                    winner = endpoint
+                    break
+        finally:
+            # Don't wait for slower probes once a winner is known
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._set_winner(state, winner)
+        return winner
+
+    def invalidate(self):
+        """Forget the current winner, e.g. after it failed a real request"""
+        state = self._load()
+        winner = state.get('winner')
+        if winner:
+            self._record(state, winner, False, 0)
+        self._set_winner(state, None)
@@ -0,0 +1,112 @@
+import time
+
+from utils import deadline as deadlines
+from utils.tracing import traced_sleep
+
+# /intelligent/search/result status codes
+STATUS_RESULTS = 0      # records returned, more may follow
+STATUS_FINISHED = 1     # no more results will be returned
+STATUS_NOT_FOUND = 2    # unknown search id
+STATUS_PENDING = 3      # no results yet, keep polling
+
+
+class IntelXPollError(Exception):
+    """Raised when the result endpoint answers with an error"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def poll_results(session, base_url, headers, search_id, max_results=50, timeout=20,
+                 page_size=20, initial_interval=0.25, max_interval=4.0, sleep=None):
+    """
+    Yield IntelX search records as soon as they are available
+
+    Polls quickly at first and backs off exponentially while the search has
+    nothing new, pages through results with an offset until max_results and
+    stops as soon as IntelX reports the search as finished or the search
+    timeout has passed. Searches left unfinished for any reason, including
+    the run deadline, are terminated. Sleeps only block the calling worker
+    thread.
+
+    Args:
+        session: requests session used for the calls
+        base_url (str): IntelX API base URL
+        headers (dict): Request headers including the API key
+        search_id (str): ID returned by /intelligent/search
+        max_results (int): Stop after this many records
+        timeout (float): Give up after this many seconds
+    """
+    sleep = sleep or (lambda seconds: traced_sleep(seconds, 'intelx poll'))
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    offset = 0
+    finished = False
+
+    try:
+        while offset < max_results:
+            response = session.get(
+                f"{base_url}/intelligent/search/result",
+                headers=headers,
+                params={
+                    'id': search_id,
+                    'limit': min(page_size, max_results - offset),
+                    'statistics': 1,
+                    'offset': offset,
+                },
+                timeout=15
+            )
+            if response.status_code != 200:
+                raise IntelXPollError(f"IntelX result request failed: {response.status_code}", response.status_code)
+
+            try:
+                data = response.json()
+            except ValueError:
+                raise IntelXPollError("Failed to parse IntelX results")
+
+            records = data.get('records') or []
+            for record in records[:max_results - offset]:
+                yield record
+            offset += len(records)
+
+            status = data.get('status', STATUS_FINISHED)
+            if status in (STATUS_FINISHED, STATUS_NOT_FOUND):
+                finished = True
+                return
+
+            if records:
+                # More pages may already be waiting; fetch them right away
+                interval = initial_interval
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+    finally:
+        if not finished:
+            # Stopped before IntelX finished (limit, timeout, error or deadline):
+            # free the search so it stops counting against the account
+            terminate_search(session, base_url, headers, search_id)
+
+
+def terminate_search(session, base_url, headers, search_id):
+    """Best-effort request to stop a search we no longer need results from
+
+    Sent with its own short timeout, not the run deadline: a search stopped
+    because the deadline passed must still be terminated.
+    """
+    outside_deadline = deadlines.current.set(None)
+    try:
+        session.get(
+            f"{base_url}/intelligent/search/terminate",
+            headers=headers,
+            params={'id': search_id},
+            timeout=5
+        )
+    except Exception:
+        pass
+    finally:
+        deadlines.current.reset(outside_deadline)
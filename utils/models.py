@@ -0,0 +1,250 @@
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+# Source result statuses
+FOUND = 'found'          # the source returned matches
+CLEAN = 'clean'          # the source answered with no matches
+SKIPPED = 'skipped'      # the source was not queried (missing key, disabled...)
+ERROR = 'error'          # the source could not be queried
+TIMED_OUT = 'timed_out'  # the source ran out of its time budget or the run deadline
+CANCELLED = 'cancelled'  # the run was interrupted before the source finished
+
+
+def _compact(obj) -> Dict[str, Any]:
+    """Serialize a slots dataclass, dropping empty values"""
+    out = {}
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        if value in (None, '', 0, [], {}):
+            continue
+        if isinstance(value, list):
+            value = [_compact(v) if hasattr(v, '__dataclass_fields__') else v for v in value]
+        out[f.name] = value
+    return out
+
+
+@dataclass(slots=True)
+class Breach:
+    """A breach an account appears in"""
+    name: str
+    source: str
+    date: Optional[str] = None
+    data_classes: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class CredentialLeak:
+    """A leaked credential row (passwords and hashes are stored truncated)"""
+    database: str
+    source: str
+    username: Optional[str] = None
+    password: Optional[str] = None
+    hashed_password: Optional[str] = None
+
+
+@dataclass(slots=True)
+class LeakRecord:
+    """A document found in a leak search engine such as IntelX"""
+    name: str
+    source: str
+    date: Optional[str] = None
+    bucket: Optional[str] = None
+    media: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PasteHit:
+    """A web or paste site search result
+
+    After merging (see utils.hit_index) queries and sources list every
+    query and source that found the same page.
+    """
+    title: str
+    url: str
+    source: str
+    snippet: Optional[str] = None
+    query: Optional[str] = None
+    queries: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ProfileField:
+    """A single named value, e.g. a Gravatar profile field or a link"""
+    name: str
+    value: str
+
+
+@dataclass(slots=True)
+class SourceError:
+    """An error raised while querying a source"""
+    source: str
+    message: str
+    status_code: Optional[int] = None
+
+
+_LIST_TYPES = {
+    'breaches': Breach,
+    'credentials': CredentialLeak,
+    'records': LeakRecord,
+    'pastes': PasteHit,
+    'profile': ProfileField,
+    'links': ProfileField,
+    'errors': SourceError,
+}
+
+
+@dataclass(slots=True)
+class SourceResult:
+    """Everything a single source returned for one target"""
+    source: str
+    status: str = CLEAN
+    total: int = 0
+    url: Optional[str] = None
+    breaches: List[Breach] = field(default_factory=list)
+    credentials: List[CredentialLeak] = field(default_factory=list)
+    records: List[LeakRecord] = field(default_factory=list)
+    pastes: List[PasteHit] = field(default_factory=list)
+    profile: List[ProfileField] = field(default_factory=list)
+    links: List[ProfileField] = field(default_factory=list)
+    databases: Dict[str, int] = field(default_factory=dict)
+    errors: List[SourceError] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    cached: bool = False
+    truncated: bool = False   # stopped early by the deadline or a source budget
+
+    def error(self, message, status_code=None) -> 'SourceResult':
+        """Record an error and mark the result as failed"""
+        self.status = ERROR
+        self.errors.append(SourceError(self.source, message, status_code))
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _compact(self)
+
+    @classmethod
+    def stopped(cls, source: str, reason: str) -> 'SourceResult':
+        """Result for a source stopped before it answered (deadline, budget or Ctrl-C)"""
+        status = CANCELLED if reason == 'interrupted' else TIMED_OUT
+        return cls(source, status=status, notes=[f"Stopped before finishing: {reason}"])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SourceResult':
+        kwargs = dict(data)
+        for name, item_type in _LIST_TYPES.items():
+            if name in kwargs:
+                kwargs[name] = [item_type(**item) for item in kwargs[name]]
+        return cls(**kwargs)
+
+
+@dataclass(slots=True)
+class ReportDiff:
+    """What changed for a target since its previous scan (see utils.history)"""
+    email: str
+    previous_scan: Optional[str] = None
+    rescanned: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    new_breaches: List[Breach] = field(default_factory=list)
+    removed_breaches: List[Breach] = field(default_factory=list)
+    new_credentials: List[CredentialLeak] = field(default_factory=list)
+    removed_credentials: List[CredentialLeak] = field(default_factory=list)
+    new_records: List[LeakRecord] = field(default_factory=list)
+    removed_records: List[LeakRecord] = field(default_factory=list)
+    new_hits: List[PasteHit] = field(default_factory=list)
+    removed_hits: List[PasteHit] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return any((self.new_breaches, self.removed_breaches, self.new_credentials, self.removed_credentials,
+                    self.new_records, self.removed_records, self.new_hits, self.removed_hits))
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            'new': len(self.new_breaches) + len(self.new_credentials) + len(self.new_records) + len(self.new_hits),
+            'removed': (len(self.removed_breaches) + len(self.removed_credentials)
+                        + len(self.removed_records) + len(self.removed_hits)),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _compact(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReportDiff':
+        kwargs = dict(data)
+        for kind, item_type in (('breaches', Breach), ('credentials', CredentialLeak),
+                                ('records', LeakRecord), ('hits', PasteHit)):
+            for name in (f'new_{kind}', f'removed_{kind}'):
+                if name in kwargs:
+                    kwargs[name] = [item_type(**item) for item in kwargs[name]]
+        return cls(**kwargs)
+
+
+
+@dataclass(slots=True)
+class EmailReport:
+    """Combined findings of every source for one email address"""
+    email: str
+    generated_at: str = field(default_factory=lambda: time.strftime('%Y-%m-%d %H:%M:%S'))
+    results: Dict[str, SourceResult] = field(default_factory=dict)
+    changes: Optional[ReportDiff] = None   # set by --rescan
+
+    def add(self, result: SourceResult):
+        self.results[result.source] = result
+
+    @property
+    def breaches(self) -> List[Breach]:
+        return [b for r in self.results.values() for b in r.breaches]
+
+    @property
+    def pastes(self) -> List[PasteHit]:
+        return [p for r in self.results.values() for p in r.pastes]
+
+    @property
+    def hits(self) -> List[PasteHit]:
+        """Search and paste hits from every source, duplicates merged"""
+        from utils.hit_index import HitIndex
+        return HitIndex(self.pastes).hits
+
+    @property
+    def errors(self) -> List[SourceError]:
+        return [e for r in self.results.values() for e in r.errors]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact form; search hits are listed once under 'hits' with every finder"""
+        results = {}
+        for name, result in self.results.items():
+            results[name] = result.to_dict()
+            results[name].pop('pastes', None)
+
+        hits = []
+        for hit in self.hits:
+            data = _compact(hit)
+            data.pop('source', None)
+            data.pop('query', None)
+            hits.append(data)
+
+        data = {'email': self.email, 'generated_at': self.generated_at, 'results': results}
+        if hits:
+            data['hits'] = hits
+        if self.changes is not None:
+            data['changes'] = self.changes.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EmailReport':
+        report = cls(
+            email=data['email'],
+            generated_at=data.get('generated_at', ''),
+            results={name: SourceResult.from_dict(r) for name, r in data.get('results', {}).items()},
+            changes=ReportDiff.from_dict(data['changes']) if data.get('changes') else None,
+        )
+        # Hand merged hits back to every source that found them
+        for hit in data.get('hits', []):
+            queries = hit.get('queries') or [None]
+            for source in hit.get('sources', []):
+                result = report.results.setdefault(source, SourceResult(source))
+                result.pastes.append(PasteHit(hit['title'], hit['url'], source, hit.get('snippet'), queries[0]))
+        return report
+
@@ -1,12 +1,189 @@
-from duckduckgo_search import DDGS
-
-def search_by_name(name):
-    print("[*] Searching DuckDuckGo...")
-    with DDGS() as ddgs:
-        results = ddgs.text(name, max_results=5)
-        if results:
-            for r in results:
-                print(f"[+] {r['title']} - {r['url']}")
-        else:
-            print("[-] No results found.")
+import asyncio
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+from utils.ddg_scheduler import get_scheduler, normalize_query, paste_site_query
+from utils.deadline import DeadlineExceeded, WorkerPool
+from utils.hit_index import HitIndex, normalize_url
+from utils.models import FOUND, PasteHit, SourceResult
+
+# Hits fetched per variant and kept in the final result
+MAX_RESULTS = 10
+MAX_HITS = 30
+
+# Webmail domains say nothing about where a person works
+FREE_MAIL_DOMAINS = {
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'live.com',
+    'msn.com', 'aol.com', 'icloud.com', 'me.com', 'proton.me', 'protonmail.com',
+    'gmx.com', 'gmx.de', 'mail.com', 'yandex.com', 'zoho.com',
+}
+
+
+def name_variants(name: str, email: Optional[str] = None,
+                  organization: Optional[str] = None) -> List[Tuple[str, float]]:
+    """
+    Search queries for a name, most telling first, with the weight of a hit found by each
+
+    The quoted full name is always searched; reversed order and initials
+    catch directories and citations, and the email domain or organization
+    narrows common names down to the right person.
+    """
+    parts = re.sub(r'\s+', ' ', name.replace('"', '')).strip().split(' ')
+    full = ' '.join(parts)
+    if not full:
+        return []
+
+    variants = [(f'"{full}"', 3.0)]
+    domain = email.rsplit('@', 1)[-1].lower() if email and '@' in email else None
+    if domain and domain not in FREE_MAIL_DOMAINS:
+        variants.append((f'"{full}" "{domain}"', 2.5))
+    if organization and organization.strip():
+        variants.append((f'"{full}" "{organization.strip()}"', 2.5))
+    if len(parts) > 1:
+        first, last = parts[0], parts[-1]
+        variants.append((f'"{last} {" ".join(parts[:-1])}"', 2.0))
+        variants.append((f'"{first[0]}. {last}"', 1.5))
+        if len(parts) > 2:
+            variants.append((f'"{first} {" ".join(p[0] + "." for p in parts[1:-1])} {last}"', 1.5))
+    variants.append((paste_site_query(full), 1.0))
+
+    # Equivalent spellings are only searched once
+    unique, seen = [], set()
+    for query, weight in variants:
+        key = normalize_query(query)
+        if key not in seen:
+            seen.add(key)
+            unique.append((query, weight))
+    return unique
+
+
+class NameSearch:
+    """
+    Run every variant of a name through the shared DuckDuckGo scheduler at once
+
+    Hits are merged across variants (the same page found by several
+    queries is one hit) and ranked by the weight of the queries that found
+    it, how high they placed it and whether it mentions the full name.
+    """
+
+    def __init__(self, name: str, email: Optional[str] = None, organization: Optional[str] = None,
+                 config: Optional[Dict] = None, scheduler=None, max_results: int = MAX_RESULTS):
+        config = config or {}
+        self.name = name.strip()
+        self.variants = name_variants(name, email, organization)
+        self.weights = dict(self.variants)
+        self.scheduler = scheduler or get_scheduler(config)
+        self.max_results = config.get('name_search_results', max_results)
+        self.index = HitIndex()
+        self.positions: Dict[str, int] = {}
+        self.failed: List[Tuple[str, str]] = []
+        self.completed = 0
+        self.stopped = False
+
+    def score(self, hit: PasteHit) -> float:
+        key = normalize_url(hit.url) or hit.title
+        score = sum(self.weights.get(query, 1.0) for query in hit.queries)
+        score += 1.0 / (1 + self.positions.get(key, 0))
+        text = f"{hit.title} {hit.snippet or ''}".lower()
+        if self.name.lower() in text:
+            score += 2.0
+        return score
+
+    def ranked(self) -> List[PasteHit]:
+        return sorted(self.index, key=self.score, reverse=True)
+
+    def _add(self, query: str, raw_hits: List[Dict]) -> List[PasteHit]:
+        """Merge one variant's hits; returns the pages not seen before"""
+        new = []
+        for position, raw in enumerate(raw_hits):
+            hit = PasteHit(title=raw.get('title', 'N/A'), url=raw.get('href', 'N/A'), source='name',
+                           snippet=raw.get('body'), query=query)
+            key = normalize_url(hit.url) or hit.title
+            seen = key in self.positions
+            self.positions[key] = min(position, self.positions.get(key, position))
+            merged = self.index.add(hit)
+            if not seen:
+                new.append(merged)
+        return new
+
+    async def stream(self) -> AsyncIterator[Tuple[str, List[PasteHit], Optional[Exception]]]:
+        """
+        Yield (query, new_hits, error) as each variant completes
+
+        new_hits are the pages that variant found first, best first. Variants
+        are started in priority order, as many at a time as the scheduler
+        lets through, so a deadline cuts the least useful ones.
+        """
+        loop = asyncio.get_running_loop()
+        queue = iter(self.variants)
+        running: Dict[asyncio.Future, str] = {}
+        # Daemon threads (not the loop's default executor), so a query given up
+        # on at the deadline never holds the process open
+        pool = WorkerPool(self.scheduler.concurrency, name='name-search')
+
+        def launch():
+            query, _ = next(queue, (None, None))
+            if query is not None:
+                running[loop.run_in_executor(pool, self.scheduler.search, query, self.max_results)] = query
+
+        for _ in range(self.scheduler.concurrency):
+            launch()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    query = running.pop(task)
+                    try:
+                        raw_hits = task.result()
+                    except DeadlineExceeded as e:
+                        # Out of time: the remaining variants would stop the same way
+                        self.stopped = True
+                        queue = iter(())
+                        yield query, [], e
+                        continue
+                    except Exception as e:
+                        self.failed.append((query, str(e)))
+                        launch()
+                        yield query, [], e
+                        continue
+                    self.completed += 1
+                    launch()
+                    yield query, sorted(self._add(query, raw_hits), key=self.score, reverse=True), None
+        finally:
+            for task in running:
+                task.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def result(self, max_hits: int = MAX_HITS) -> SourceResult:
+        """The ranked hits collected so far as a SourceResult"""
+        result = SourceResult('name')
+        ranked = self.ranked()
+        result.pastes = ranked[:max_hits]
+        result.total = len(ranked)
+        for query, message in self.failed:
+            result.error(f"Query '{query}' failed: {message}")
+        if ranked:
+            # Failed variants only narrow the coverage
+            result.status = FOUND
+        result.notes.append(
+            f"{len(ranked)} unique of {self.index.added} results across {self.completed} of "
+            f"{len(self.variants)} name variants"
+        )
+        if self.stopped:
+            result.notes.append("Search interrupted before all variants ran")
+        return result
+
+
+async def search_by_name_async(name: str, email: Optional[str] = None, organization: Optional[str] = None,
+                               config: Optional[Dict] = None, scheduler=None) -> SourceResult:
+    """Search all variants of a name concurrently and return the ranked, merged hits"""
+    search = NameSearch(name, email, organization, config, scheduler)
+    async for _ in search.stream():
+        pass
+    return search.result()
+
+
+def search_by_name(name: str, email: Optional[str] = None, organization: Optional[str] = None,
+                   config: Optional[Dict] = None) -> SourceResult:
+    """Blocking wrapper for worker threads (e.g. a SourceEngine job)"""
+    return asyncio.run(search_by_name_async(name, email, organization, config))
@@ -0,0 +1,169 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+# Findings budget (in estimated tokens) per model; the rest of the context
+# window is left for instructions and the answer.
+DEFAULT_TOKEN_BUDGETS = {
+    'gpt-3.5-turbo': 3000,
+    'gemini-pro': 6000,
+}
+DEFAULT_TOKEN_BUDGET = 3000
+
+# Lower numbers are included first when the budget is tight
+PRIORITIES = {
+    'breaches': 0,
+    'credentials': 0,
+    'records': 1,
+    'hits': 2,
+    'pastes': 2,
+    'profile': 3,
+    'errors': 5,
+    'links': 6,
+}
+DEFAULT_PRIORITY = 4
+
+# Fields with no value for the analysis
+DROP_KEYS = {'generated_at', 'elapsed', 'cached'}
+STRING_LIMIT = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English/JSON)"""
+    return len(text) // 4 + 1
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def token_budget_for(model: str, config: Optional[Dict] = None) -> int:
+    """Token budget for a model, from config 'ai_token_budget' (int or per-model dict)"""
+    configured: Union[int, Dict, None] = (config or {}).get('ai_token_budget')
+    if isinstance(configured, dict):
+        if model in configured:
+            return int(configured[model])
+    elif configured:
+        return int(configured)
+    return DEFAULT_TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)
+
+
+def normalize_findings(value):
+    """Drop empty values and noise, shorten long strings, dedupe lists"""
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if key in DROP_KEYS:
+                continue
+            item = normalize_findings(item)
+            if item not in (None, '', [], {}):
+                out[key] = item
+        return out
+    if isinstance(value, (list, tuple, set)):
+        out, seen = [], set()
+        for item in value:
+            item = normalize_findings(item)
+            marker = _dumps(item)
+            if item in (None, '', [], {}) or marker in seen:
+                continue
+            seen.add(marker)
+            out.append(item)
+        return out
+    if isinstance(value, str) and len(value) > STRING_LIMIT:
+        return value[:STRING_LIMIT] + '…'
+    if hasattr(value, 'to_dict'):
+        return normalize_findings(value.to_dict())
+    return value
+
+
+def _canonical(value):
+    # Sorted lists make the hash independent of the order sources finished in
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return sorted((_canonical(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True, default=str))
+    return value
+
+
+def findings_digest(findings: Dict[str, Any]) -> str:
+    """Stable hash of the findings, ignoring timestamps, timings and ordering"""
+    canonical = json.dumps(_canonical(normalize_findings(findings)), sort_keys=True,
+                           separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class PromptData:
+    """Findings serialized for a prompt, with what had to be left out"""
+    text: str
+    included: int
+    total: int
+    tokens: int
+    budget: int
+
+    @property
+    def complete(self) -> bool:
+        return self.included == self.total
+
+    def summary(self) -> str:
+        return (f"{self.included}/{self.total} findings included "
+                f"(~{self.tokens} of {self.budget} tokens)")
+
+
+def compact_findings(findings: Dict[str, Any], token_budget: int = DEFAULT_TOKEN_BUDGET) -> PromptData:
+    """
+    Serialize findings as compact JSON that fits a token budget
+
+    Every list of findings (breaches, hits, ...) is pulled out of the
+    structure and its items are added back by priority until the budget is
+    spent. Lists that lost items get a '<name>_omitted' count so the model
+    knows the data is partial.
+    """
+    data = normalize_findings(findings) or {}
+
+    # (priority, order, container, key, items) for every list of objects
+    slots = []
+
+    def extract(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, list) and value and all(isinstance(i, dict) for i in value):
+                    slots.append((PRIORITIES.get(key, DEFAULT_PRIORITY), len(slots), node, key, value))
+                else:
+                    extract(value)
+
+    extract(data)
+    for _, _, container, key, _ in slots:
+        container[key] = []
+
+    used = estimate_tokens(_dumps(data))
+    # Keep room for the '_omitted' counters
+    reserve = 8 * len(slots)
+    total = sum(len(items) for *_, items in slots)
+    included = 0
+    omitted = [0] * len(slots)
+
+    # Interleave lists of the same priority so none of them starves the others
+    queue = sorted(
+        ((priority, index, order, item) for priority, order, _, _, items in slots for index, item in enumerate(items)),
+        key=lambda entry: entry[:3]
+    )
+    for _, _, order, item in queue:
+        cost = estimate_tokens(_dumps(item)) + 1
+        container, key = slots[order][2], slots[order][3]
+        if used + cost + reserve <= token_budget:
+            container[key].append(item)
+            used += cost
+            included += 1
+        else:
+            omitted[order] += 1
+
+    for order, (_, _, container, key, _) in enumerate(slots):
+        if not container[key]:
+            del container[key]
+        if omitted[order]:
+            container[f"{key}_omitted"] = omitted[order]
+
+    text = _dumps(data)
+    return PromptData(text, included, total, estimate_tokens(text), token_budget)
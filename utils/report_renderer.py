@@ -0,0 +1,253 @@
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from utils.hit_index import HitIndex
+from utils.models import FOUND, CLEAN, SKIPPED, ERROR, TIMED_OUT, CANCELLED
+
+console = Console()
+
+# Sources are rendered in this order, whatever order they finished in
+SOURCE_ORDER = [
+    'gravatar', 'hibp', 'intelx', 'dehashed', 'leakcheck',
+    'breach_directory', 'social_media', 'duckduckgo',
+]
+
+SOURCE_TITLES = {
+    'gravatar': 'Gravatar',
+    'hibp': 'Have I Been Pwned',
+    'intelx': 'IntelligenceX',
+    'dehashed': 'DeHashed',
+    'leakcheck': 'LeakCheck',
+    'breach_directory': 'Breach Directories',
+    'social_media': 'Social Media Associations',
+    'duckduckgo': 'DuckDuckGo searches',
+    'name': 'Name search',
+}
+
+
+def _shorten(value, length):
+    value = value or 'N/A'
+    return value[:length] + "..." if len(value) > length else value
+
+
+def render_header(report):
+    """Print the report banner"""
+    console.print("\n" + "="*80)
+    console.print(Panel.fit(
+        f"[bold]OSINT Report for: {report.email}[/bold]\n"
+        f"[dim]Generated on: {report.generated_at}[/dim]",
+        border_style="green"
+    ))
+
+
+def _render_gravatar(result):
+    if result.status == FOUND:
+        console.print(f"[green]✓ Gravatar found:[/green] {result.url}")
+        for item in result.profile:
+            console.print(f"[cyan]   {item.name}:[/cyan] {item.value}")
+    elif result.status == CLEAN:
+        console.print("[yellow]⚠ No Gravatar found[/yellow]")
+
+
+def _render_hibp(result):
+    if result.status == FOUND:
+        console.print(f"[red]⚠ Found in {len(result.breaches)} breach(es):[/red]")
+
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Breach Name", style="red")
+        table.add_column("Date", style="yellow")
+        table.add_column("Compromised Data", style="cyan")
+
+        for breach in result.breaches:
+            table.add_row(breach.name, breach.date or 'N/A', ", ".join(breach.data_classes))
+        console.print(table)
+    elif result.status == CLEAN:
+        console.print("[green]✓ No breaches found in HIBP[/green]")
+
+
+def _render_intelx(result):
+    if result.status == FOUND:
+        console.print(f"[red]⚠ Found {result.total} record(s) in IntelX:[/red]")
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Type", style="red")
+        table.add_column("Date", style="cyan")
+        table.add_column("Source", style="yellow")
+        table.add_column("Media", style="green")
+
+        for record in result.records[:10]:
+            table.add_row(record.name, record.date or 'N/A', record.bucket or 'N/A', record.media or 'N/A')
+        console.print(table)
+    elif result.status == CLEAN:
+        console.print("[green]✓ No matches found in IntelX[/green]")
+
+
+def _render_dehashed(result):
+    if result.status == FOUND:
+        console.print(f"[red]⚠ Found {result.total} entries in DeHashed[/red]")
+
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Database", style="red")
+        table.add_column("Username", style="yellow")
+        table.add_column("Password", style="cyan")
+        table.add_column("Hash", style="green")
+
+        for entry in result.credentials[:10]:
+            table.add_row(entry.database, entry.username or 'N/A',
+                          entry.password or 'N/A', entry.hashed_password or 'N/A')
+        console.print(table)
+
+        if len(result.databases) > 1 or result.total > 10:
+            summary = Table(show_header=True, header_style="bold magenta")
+            summary.add_column("Database", style="red")
+            summary.add_column("Entries", justify="right")
+            for database, count in result.databases.items():
+                summary.add_row(database, str(count))
+            console.print(summary)
+    elif result.status == CLEAN:
+        console.print("[green]✓ No entries found in DeHashed[/green]")
+
+
+def _render_leakcheck(result):
+    if result.status == FOUND:
+        console.print(f"[red]⚠ Found in {len(result.breaches)} source(s):[/red]")
+        for breach in result.breaches:
+            console.print(f"[cyan]   • {breach.name}[/cyan]")
+    elif result.status == CLEAN:
+        console.print("[green]✓ No leaks found in LeakCheck[/green]")
+
+
+def _render_breach_directory(result):
+    if result.status == FOUND:
+        # total survives the report's dict form, where hits are merged across sources
+        console.print(f"[yellow]⚠ Found {result.total or len(result.pastes)} potential paste site matches[/yellow]")
+    elif result.status == CLEAN:
+        console.print("[green]✓ No obvious matches in breach directories[/green]")
+
+    if result.links:
+        console.print("[dim]Manual search URLs:[/dim]")
+        for link in result.links:
+            console.print(f"[cyan]   {link.name}: {link.value}[/cyan]")
+
+
+def _render_social_media(result):
+    for link in result.links:
+        console.print(f"[cyan]   {link.name}:[/cyan] {link.value}")
+
+
+def render_search_hits(hits):
+    """Print web and paste site hits, with duplicate pages merged"""
+    index = HitIndex(hits)
+    if not len(index):
+        console.print("[yellow]No DuckDuckGo results found.[/yellow]")
+        return
+
+    console.print(f"\n[bold magenta]Web and paste site results ({len(index)} unique"
+                  f"{f', {index.duplicates} duplicates merged' if index.duplicates else ''})[/bold magenta]")
+
+    # Columns share the terminal width; "Found by" is the point of merging
+    # duplicates, so it keeps a minimum width instead of being squeezed out
+    table = Table(show_header=True, header_style="bold cyan", expand=True)
+    table.add_column("Title", style="white", ratio=3, max_width=40, overflow="fold")
+    table.add_column("URL", style="blue", ratio=4, max_width=50, overflow="fold")
+    table.add_column("Found by", style="magenta", ratio=2, min_width=14, max_width=30, overflow="fold")
+    table.add_column("Description", style="dim white", ratio=3, max_width=60)
+
+    for item in index:
+        found_by = "\n".join(item.queries or item.sources)
+        table.add_row(_shorten(item.title, 40), item.url or 'N/A', found_by, _shorten(item.snippet, 60))
+    console.print(table)
+
+
+def _render_duckduckgo(result):
+    if result.total or result.pastes:
+        console.print(f"[green]✓ Found {result.total or len(result.pastes)} total results from DuckDuckGo[/green]")
+    elif result.status != SKIPPED:
+        console.print("[yellow]⚠ No results found from DuckDuckGo searches[/yellow]")
+
+
+def _render_name(result):
+    if result.pastes:
+        render_search_hits(result.pastes)
+    elif result.status != SKIPPED:
+        console.print("[yellow]⚠ No results found for the name or its variants[/yellow]")
+
+
+_RENDERERS = {
+    'gravatar': _render_gravatar,
+    'hibp': _render_hibp,
+    'intelx': _render_intelx,
+    'dehashed': _render_dehashed,
+    'leakcheck': _render_leakcheck,
+    'breach_directory': _render_breach_directory,
+    'social_media': _render_social_media,
+    'duckduckgo': _render_duckduckgo,
+    'name': _render_name,
+}
+
+
+def render_result(result):
+    """Print a single source result"""
+    title = SOURCE_TITLES.get(result.source, result.source)
+    cached = " [dim](cached)[/dim]" if result.cached else ""
+    console.print(f"[bold blue]🔍 {title}[/bold blue]{cached}")
+
+    renderer = _RENDERERS.get(result.source)
+    if renderer and result.status != SKIPPED:
+        renderer(result)
+
+    for error in result.errors:
+        style = "red" if result.status == ERROR else "yellow"
+        console.print(f"[{style}]✗ {error.message}[/{style}]")
+    for note in result.notes:
+        style = "yellow" if result.status in (SKIPPED, TIMED_OUT, CANCELLED) else "cyan"
+        console.print(f"[{style}]ℹ {note}[/{style}]")
+
+
+def render_changes(diff):
+    """Print what a rescan found or no longer found since the previous scan"""
+    since = f" since {diff.previous_scan}" if diff.previous_scan else ""
+    console.print(f"[bold blue]🔄 Changes{since}[/bold blue]")
+    if diff.previous_scan is None:
+        console.print("[dim]No earlier scan of this address; the next --rescan will be compared with this one[/dim]")
+    elif not diff.changed:
+        console.print("[green]✓ Nothing new[/green]")
+
+    for breach in diff.new_breaches:
+        console.print(f"[red]+ New breach:[/red] {breach.name} [dim]({breach.source})[/dim]")
+    for leak in diff.new_credentials:
+        console.print(f"[red]+ New credential:[/red] {leak.database} / {leak.username or 'N/A'}")
+    for record in diff.new_records:
+        console.print(f"[red]+ New leak record:[/red] {record.name} [dim]({record.source})[/dim]")
+    for hit in diff.new_hits:
+        console.print(f"[red]+ New web hit:[/red] {hit.title} [dim]{hit.url}[/dim]")
+    for breach in diff.removed_breaches:
+        console.print(f"[green]- No longer listed:[/green] {breach.name} [dim]({breach.source})[/dim]")
+    for leak in diff.removed_credentials:
+        console.print(f"[green]- No longer listed:[/green] {leak.database} / {leak.username or 'N/A'}")
+    for record in diff.removed_records:
+        console.print(f"[green]- No longer listed:[/green] {record.name} [dim]({record.source})[/dim]")
+    for hit in diff.removed_hits:
+        console.print(f"[green]- No longer found:[/green] {hit.title} [dim]{hit.url}[/dim]")
+
+    if diff.reused:
+        console.print(f"[dim]Re-queried: {', '.join(diff.rescanned) or 'none'} — "
+                      f"still fresh, not re-queried: {', '.join(diff.reused)}[/dim]")
+    console.print()
+
+
+def render_report(report):
+    """Render every source result followed by the report banner"""
+    names = [n for n in SOURCE_ORDER if n in report.results]
+    names += [n for n in report.results if n not in SOURCE_ORDER]
+    for name in names:
+        render_result(report.results[name])
+        console.print()
+
+    # Hits from all search sources are shown once, in a single merged table
+    if report.pastes:
+        render_search_hits(report.pastes)
+
+    if report.changes is not None:
+        render_changes(report.changes)
+
+    render_header(report)
@@ -0,0 +1,212 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils import deadline as deadlines
+from utils.deadline import Deadline, DeadlineExceeded, WorkerPool
+from utils.tracing import span
+
+# Maximum number of in-flight calls per rate-limit group. Sources that hit the
+# same upstream (both DuckDuckGo checks) share a group so they never overlap.
+DEFAULT_CONCURRENCY = {
+    'gravatar': 4,
+    'hibp': 1,
+    'intelx': 2,
+    'dehashed': 2,
+    'leakcheck': 2,
+    'duckduckgo': 1,
+    'local': 8,
+}
+
+# Seconds a stopped check gets to hand back what it collected so far
+DEFAULT_GRACE = 0.5
+
+
+@dataclass
+class SourceJob:
+    """A single independent lookup to be run by the engine"""
+    name: str
+    label: str
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    group: Optional[str] = None
+
+
+class SourceEngine:
+    """Run blocking source checks concurrently with per-group concurrency limits"""
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None, grace: float = DEFAULT_GRACE):
+        self.concurrency = dict(DEFAULT_CONCURRENCY)
+        if concurrency:
+            self.concurrency.update(concurrency)
+        self.grace = grace
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._executor: Optional[WorkerPool] = None
+
+    def _semaphore(self, group: str) -> asyncio.Semaphore:
+        if group not in self._semaphores:
+            self._semaphores[group] = asyncio.Semaphore(max(1, int(self.concurrency.get(group, 1))))
+        return self._semaphores[group]
+
+    def _pool(self) -> WorkerPool:
+        # One thread per slot of every group, so a check never waits for a
+        # thread once its group lets it run (the loop's default executor is
+        # smaller than that on small machines and shared with everything else).
+        # Its threads never hold the process open after a deadline stop.
+        if self._executor is None:
+            workers = sum(max(1, int(limit)) for limit in self.concurrency.values())
+            self._executor = WorkerPool(workers, name='source')
+        return self._executor
+
+    @staticmethod
+    def _traced(job: SourceJob, waited: float, limit: Deadline, budget: Optional[float] = None,
+                started: Optional[Callable[[], None]] = None):
+        # The budget counts from here, once a thread has picked the check up
+        limit.start(budget)
+        if started is not None:
+            started()
+        # Sleeps and HTTP requests inside the check look at this deadline
+        deadlines.current.set(limit)
+        with span(job.name, 'source', group=job.group or job.name, waited=round(waited, 3)) as current:
+            result = job.func(*job.args)
+            current.set(status=getattr(result, 'status', None), cached=getattr(result, 'cached', False))
+            return result
+
+    async def _run_limited(self, job: SourceJob, waited: float, limit: Deadline, budget: Optional[float],
+                           slot: asyncio.Semaphore):
+        """Run a check in a worker thread until it finishes or its deadline stops it
+
+        slot (the group's semaphore) is released when the thread ends, not
+        when the check is given up on, so a stopped check that is still
+        running keeps its thread accounted for.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+
+        def mark_started():
+            loop.call_soon_threadsafe(lambda: started.done() or started.set_result(None))
+
+        # The pool runs the check in a copy of this task's context
+        worker = loop.run_in_executor(self._pool(), self._traced, job, waited, limit, budget, mark_started)
+        worker.add_done_callback(lambda _: slot.release())
+        stop = asyncio.ensure_future(limit.wait())
+        try:
+            while True:
+                waiting = {worker, stop} if started.done() else {worker, stop, started}
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if worker in done:
+                    result = worker.result()
+                    if limit.expired():
+                        # Finished while being stopped: it may have been cut short too
+                        self._mark_stopped(result, limit.reason or 'deadline reached')
+                    return result
+                if stop in done:
+                    break
+                # The check just started: wait again now that its budget runs
+                stop.cancel()
+                stop = asyncio.ensure_future(limit.wait())
+
+            if not limit.cancelled:
+                expired_run = limit.parent is not None and limit.parent.expired()
+                limit.cancel('deadline reached' if expired_run or budget is None else f"{budget:g}s budget used up")
+            # The thread cannot be killed, but its sleeps and requests now fail
+            # fast; whatever it collected until then is still worth having.
+            done, _ = await asyncio.wait({worker}, timeout=self.grace)
+            if worker not in done:
+                raise DeadlineExceeded(limit.reason)
+            result = worker.result()
+            if getattr(result, 'status', None) == 'error':
+                # Failed because it was stopped: report the stop, not the symptom
+                raise DeadlineExceeded(limit.reason)
+            self._mark_stopped(result, limit.reason)
+            return result
+        finally:
+            stop.cancel()
+            limit.detach()
+
+    @staticmethod
+    def _mark_stopped(result, reason: str):
+        """Flag a result the deadline cut short so history never takes it as a full answer"""
+        if hasattr(result, 'notes'):
+            result.notes.append(f"Stopped early ({reason}); results may be incomplete")
+            result.truncated = True
+
+    async def _run_job(self, job: SourceJob, progress=None, events=None, deadline=None, budgets=None):
+        task_id = None
+        if progress is not None:
+            task_id = progress.add_task(f"[dim]{job.label}: queued", total=None)
+
+        def status(description, finished=False):
+            if progress is None:
+                return
+            if finished:
+                progress.update(task_id, description=description, total=1, completed=1)
+            else:
+                progress.update(task_id, description=description)
+
+        budgets = budgets or {}
+        budget = budgets.get(job.name, budgets.get(job.group))
+        queued = time.perf_counter()
+        slot = self._semaphore(job.group or job.name)
+        await slot.acquire()
+        handed_off = False
+        try:
+            start = time.perf_counter()
+            # Only the run deadline applies until a thread picks the check up;
+            # _traced starts the budget then
+            limit = Deadline(parent=deadline)
+            try:
+                if limit.expired():
+                    limit.detach()
+                    raise DeadlineExceeded(deadline.reason if deadline and deadline.cancelled else 'deadline reached')
+                status(f"[cyan]{job.label}: running...")
+                if events is not None:
+                    events.source_started(job.name, start - queued)
+                # The checks are blocking (requests / DDGS), so each one gets a
+                # worker thread and the event loop only coordinates them.
+                handed_off = True
+                result = await self._run_limited(job, start - queued, limit, budget, slot)
+            except DeadlineExceeded as e:
+                status(f"[yellow]⏱ {job.label}: stopped ({e})[/yellow]", finished=True)
+                if events is not None:
+                    events.source_failed(job.name, e, time.perf_counter() - start)
+                return e
+            except Exception as e:
+                status(f"[red]✗ {job.label}: failed ({e})[/red]", finished=True)
+                if events is not None:
+                    events.source_failed(job.name, e, time.perf_counter() - start)
+                return e
+            elapsed = time.perf_counter() - start
+            outcome = getattr(result, 'status', None)
+            if outcome == 'error':
+                status(f"[red]✗ {job.label}: error after {elapsed:.1f}s[/red]", finished=True)
+            elif getattr(result, 'cached', False):
+                status(f"[green]✓ {job.label}: cached[/green]", finished=True)
+            elif outcome == 'skipped':
+                status(f"[dim]- {job.label}: skipped[/dim]", finished=True)
+            else:
+                status(f"[green]✓ {job.label}: done in {elapsed:.1f}s[/green]", finished=True)
+            if hasattr(result, 'elapsed') and not getattr(result, 'cached', False):
+                result.elapsed = round(elapsed, 3)
+            if events is not None:
+                events.source_finished(job.name, result, elapsed)
+            return result
+        finally:
+            if not handed_off:
+                slot.release()
+
+    async def run(self, jobs, progress=None, events=None, deadline: Optional[Deadline] = None,
+                  budgets: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Run all jobs at once and return their results keyed by job name
+
+        events (an EventStream) is told about every job as it starts and
+        finishes. Jobs still running when deadline passes (or is cancelled),
+        or when their entry in budgets (seconds, by job name or group) is used
+        up, are stopped and reported as a DeadlineExceeded instead of a result.
+        """
+        jobs = list(jobs)
+        results = await asyncio.gather(
+            *(self._run_job(job, progress, events, deadline, budgets) for job in jobs)
+        )
+        return {job.name: result for job, result in zip(jobs, results)}
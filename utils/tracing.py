@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+class Span:
+    """One timed operation: a source check, HTTP request, sleep or AI call"""
+    __slots__ = ('name', 'category', 'start', 'duration', 'thread', 'fields')
+
+    def __init__(self, name: str, category: str, fields: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = threading.get_ident()
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+class _NullSpan:
+    """Returned while tracing is off so instrumented code needs no checks"""
+
+    def set(self, **fields):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects spans for --profile; costs one attribute check when disabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        with self._lock:
+            self.enabled = True
+            self.spans = []
+            self.origin = time.perf_counter()
+
+    def disable(self):
+        self.enabled = False
+
+    @contextmanager
+    def span(self, name: str, category: str = 'run', **fields):
+        if not self.enabled:
+            yield NULL_SPAN
+            return
+
+        span = Span(name, category, fields)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.fields.setdefault('status', 'error')
+            span.fields.setdefault('error', str(e) or type(e).__name__)
+            raise
+        finally:
+            span.start = start - self.origin
+            span.duration = time.perf_counter() - start
+            with self._lock:
+                self.spans.append(span)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Spans aggregated per category and name, slowest total first"""
+        rows: Dict[tuple, Dict[str, Any]] = {}
+        for span in list(self.spans):
+            row = rows.setdefault((span.category, span.name), {
+                'category': span.category, 'name': span.name, 'count': 0, 'total': 0.0,
+                'max': 0.0, 'errors': 0, 'bytes': 0, 'retries': 0,
+            })
+            row['count'] += 1
+            row['total'] += span.duration
+            row['max'] = max(row['max'], span.duration)
+            row['bytes'] += span.fields.get('bytes') or 0
+            row['retries'] += span.fields.get('retries') or 0
+            status = span.fields.get('status')
+            if status == 'error' or (isinstance(status, int) and status >= 400):
+                row['errors'] += 1
+        return sorted(rows.values(), key=lambda row: row['total'], reverse=True)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans as Chrome trace events (open in chrome://tracing or Perfetto)"""
+        pid = os.getpid()
+        events = [
+            {
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round(span.start * 1e6),
+                'dur': round(span.duration * 1e6),
+                'pid': pid,
+                'tid': span.thread,
+                'args': {key: value if isinstance(value, (int, float, bool)) else str(value)
+                         for key, value in span.fields.items()},
+            }
+            for span in list(self.spans)
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, separators=(',', ':'))
+
+
+tracer = Tracer()
+span = tracer.span
+
+
+def traced_sleep(seconds: float, reason: str = 'sleep'):
+    """time.sleep that shows up in the trace and stops at the source's deadline"""
+    from utils import deadline
+    with tracer.span(reason, 'sleep', seconds=round(seconds, 3)):
+        deadline.sleep(seconds)
+
+
+def instrument_session(session):
+    """Record every request made through a requests session as an 'http' span"""
+    if getattr(session, '_traced', False):
+        return session
+    request = session.request
+
+    def traced_request(method, url, *args, **kwargs):
+        if not tracer.enabled:
+            return request(method, url, *args, **kwargs)
+        parts = urlsplit(url)
+        with tracer.span(f"{method.upper()} {parts.netloc}", 'http', path=parts.path) as current:
+            response = request(method, url, *args, **kwargs)
+            current.set(status=response.status_code, bytes=len(response.content))
+            return response
+
+    session.request = traced_request
+    session._traced = True
+    return session
+
+
+def print_summary(console=None, limit: Optional[int] = 25):
+    """Print where the run's time went"""
+    from rich.console import Console
+    from rich.table import Table
+
+    console = console or Console()
+    table = Table(title="Profile", show_lines=False)
+    table.add_column("Kind", style="cyan")
+    table.add_column("Operation", min_width=20)
+    table.add_column("Calls", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Err", justify="right")
+    table.add_column("Retry", justify="right")
+    table.add_column("Bytes", justify="right")
+
+    for row in tracer.summary()[:limit]:
+        table.add_row(
+            row['category'], row['name'], str(row['count']),
+            f"{row['total'] * 1000:.0f} ms", f"{row['total'] / row['count'] * 1000:.0f} ms",
+            f"{row['max'] * 1000:.0f} ms", str(row['errors'] or ''), str(row['retries'] or ''),
+            f"{row['bytes']:,}" if row['bytes'] else '',
+        )
+    console.print(table)